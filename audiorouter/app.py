@@ -4,19 +4,29 @@ from __future__ import annotations
 import os
 import sys
 
-from .system_policy import install_system_sound_policy, remove_system_sound_policy, restart_pipewire_pulse
-from . import pactl as pa
-from .companion import companion_log_path, push_sink_state
-from .config import load_config
-
 # Make bundled modules importable inside Flatpak (if you bundle extra libs there)
 LIBDIR = "/app/lib/audiorouter"
 if os.path.isdir(LIBDIR) and LIBDIR not in sys.path:
     sys.path.insert(0, LIBDIR)
 
 
+def _parse_flags(argv: list[str]) -> dict[str, str]:
+    """Single pass over argv: every --flag maps to its following value (or "")."""
+    flags: dict[str, str] = {}
+    for i, arg in enumerate(argv):
+        if not arg.startswith("--"):
+            continue
+        nxt = argv[i + 1] if i + 1 < len(argv) else ""
+        # First occurrence wins, like the old per-flag scans.
+        flags.setdefault(arg, "" if nxt.startswith("--") else nxt.strip())
+    return flags
+
 
 def _push_companion_state_quiet(sink_name: str, debug: bool = False) -> None:
+    from . import pactl as pa
+    from .companion import companion_log_path, push_sink_state
+    from .config import load_config
+
     try:
         cfg = load_config()
         lines = push_sink_state(
@@ -36,103 +46,114 @@ def _push_companion_state_quiet(sink_name: str, debug: bool = False) -> None:
         pass
 
 
-def main():
-    if "--show-companion-log" in sys.argv:
-        path = companion_log_path()
-        if not path.exists():
-            print(f"Companion log not found: {path}")
-            return
-        print(path.read_text(encoding="utf-8"))
-        return
-
-    if "--control-sink" in sys.argv:
-        sink_name = ""
-        action = ""
-        value = ""
-        companion_debug = ("--companion-debug" in sys.argv)
-        for i, arg in enumerate(sys.argv):
-            if arg == "--control-sink" and i + 1 < len(sys.argv):
-                sink_name = sys.argv[i + 1].strip()
-            elif arg == "--action" and i + 1 < len(sys.argv):
-                action = sys.argv[i + 1].strip().lower()
-            elif arg == "--value" and i + 1 < len(sys.argv):
-                value = sys.argv[i + 1].strip()
-
-        if not sink_name:
-            print("Missing --control-sink <sink_name>", file=sys.stderr)
-            sys.exit(2)
-        if not pa.sink_exists(sink_name):
-            print(f"Sink not found: {sink_name}", file=sys.stderr)
-            sys.exit(1)
-
-        if action == "set-volume":
-            if not value:
-                print("Missing --value for action set-volume", file=sys.stderr)
-                sys.exit(2)
-            pa.set_sink_volume(sink_name, value)
-            _push_companion_state_quiet(sink_name, debug=companion_debug)
-            print(f"Volume set: {sink_name} -> {value}")
-            return
+def _cmd_show_companion_log(flags: dict[str, str]) -> None:
+    from .companion import companion_log_path
 
-        if action == "change-volume":
-            if not value:
-                print("Missing --value for action change-volume", file=sys.stderr)
-                sys.exit(2)
-            pa.change_sink_volume(sink_name, value)
-            _push_companion_state_quiet(sink_name, debug=companion_debug)
-            print(f"Volume changed: {sink_name} {value}")
-            return
+    path = companion_log_path()
+    if not path.exists():
+        print(f"Companion log not found: {path}")
+        return
+    print(path.read_text(encoding="utf-8"))
 
-        if action == "mute":
-            pa.set_sink_mute(sink_name, True)
-            _push_companion_state_quiet(sink_name, debug=companion_debug)
-            print(f"Muted: {sink_name}")
-            return
 
-        if action == "unmute":
-            pa.set_sink_mute(sink_name, False)
-            _push_companion_state_quiet(sink_name, debug=companion_debug)
-            print(f"Unmuted: {sink_name}")
-            return
+def _cmd_control_sink(flags: dict[str, str]) -> None:
+    from . import pactl as pa
 
-        if action == "toggle-mute":
-            is_muted = pa.get_sink_mute(sink_name)
-            pa.set_sink_mute(sink_name, not is_muted)
-            _push_companion_state_quiet(sink_name, debug=companion_debug)
-            print(f"Mute toggled: {sink_name} -> {'muted' if not is_muted else 'unmuted'}")
-            return
+    sink_name = flags.get("--control-sink", "")
+    action = flags.get("--action", "").lower()
+    value = flags.get("--value", "")
+    companion_debug = ("--companion-debug" in flags)
 
-        print(
-            "Unknown or missing --action. Use: set-volume, change-volume, mute, unmute, toggle-mute",
-            file=sys.stderr,
-        )
+    if not sink_name:
+        print("Missing --control-sink <sink_name>", file=sys.stderr)
         sys.exit(2)
+    if not pa.sink_exists(sink_name):
+        print(f"Sink not found: {sink_name}", file=sys.stderr)
+        sys.exit(1)
 
-    if "--install-system-policy" in sys.argv:
-        target_sink = "vsink.system"
-        for i, arg in enumerate(list(sys.argv)):
-            if arg == "--system-policy-target" and i + 1 < len(sys.argv):
-                target_sink = sys.argv[i + 1]
-                break
+    if action == "set-volume":
+        if not value:
+            print("Missing --value for action set-volume", file=sys.stderr)
+            sys.exit(2)
+        pa.set_sink_volume(sink_name, value)
+        _push_companion_state_quiet(sink_name, debug=companion_debug)
+        print(f"Volume set: {sink_name} -> {value}")
+        return
 
-        path = install_system_sound_policy(target_sink=target_sink)
-        restart_pipewire_pulse()
-        print(f"Installed system sound policy at: {path}")
+    if action == "change-volume":
+        if not value:
+            print("Missing --value for action change-volume", file=sys.stderr)
+            sys.exit(2)
+        pa.change_sink_volume(sink_name, value)
+        _push_companion_state_quiet(sink_name, debug=companion_debug)
+        print(f"Volume changed: {sink_name} {value}")
         return
 
-    if "--remove-system-policy" in sys.argv:
-        path = remove_system_sound_policy()
-        restart_pipewire_pulse()
-        print(f"Removed system sound policy file: {path}")
+    if action == "mute":
+        pa.set_sink_mute(sink_name, True)
+        _push_companion_state_quiet(sink_name, debug=companion_debug)
+        print(f"Muted: {sink_name}")
         return
 
-    daemon_mode = ("--daemon" in sys.argv) or ("--background" in sys.argv)
+    if action == "unmute":
+        pa.set_sink_mute(sink_name, False)
+        _push_companion_state_quiet(sink_name, debug=companion_debug)
+        print(f"Unmuted: {sink_name}")
+        return
 
-    if daemon_mode:
-        from .daemon import run_daemon
-        run_daemon()
+    if action == "toggle-mute":
+        is_muted = pa.get_sink_mute(sink_name)
+        pa.set_sink_mute(sink_name, not is_muted)
+        _push_companion_state_quiet(sink_name, debug=companion_debug)
+        print(f"Mute toggled: {sink_name} -> {'muted' if not is_muted else 'unmuted'}")
         return
 
+    print(
+        "Unknown or missing --action. Use: set-volume, change-volume, mute, unmute, toggle-mute",
+        file=sys.stderr,
+    )
+    sys.exit(2)
+
+
+def _cmd_install_system_policy(flags: dict[str, str]) -> None:
+    from .system_policy import install_system_sound_policy, restart_pipewire_pulse
+
+    target_sink = flags.get("--system-policy-target") or "vsink.system"
+    path = install_system_sound_policy(target_sink=target_sink)
+    restart_pipewire_pulse()
+    print(f"Installed system sound policy at: {path}")
+
+
+def _cmd_remove_system_policy(flags: dict[str, str]) -> None:
+    from .system_policy import remove_system_sound_policy, restart_pipewire_pulse
+
+    path = remove_system_sound_policy()
+    restart_pipewire_pulse()
+    print(f"Removed system sound policy file: {path}")
+
+
+def _cmd_daemon(flags: dict[str, str]) -> None:
+    from .daemon import run_daemon
+    run_daemon()
+
+
+# First matching flag wins; order mirrors the historical if-chain.
+_COMMANDS = (
+    (("--show-companion-log",), _cmd_show_companion_log),
+    (("--control-sink",), _cmd_control_sink),
+    (("--install-system-policy",), _cmd_install_system_policy),
+    (("--remove-system-policy",), _cmd_remove_system_policy),
+    (("--daemon", "--background"), _cmd_daemon),
+)
+
+
+def main():
+    flags = _parse_flags(sys.argv)
+    for names, handler in _COMMANDS:
+        if any(name in flags for name in names):
+            handler(flags)
+            return
+
     # GUI mode
     os.environ.setdefault("GSK_RENDERER", "cairo")
     from .gui import main as gui_main
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import atexit
+import functools
 import os
-import urllib.error
+import re
 import urllib.parse
-import urllib.request
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+# http.client and logging are imported on first use: config.py (and thus
+# every GUI start) imports this module, but most sessions never sync.
+if TYPE_CHECKING:
+    import http.client
+    import logging
+
+_KEY_SPLIT_RE = re.compile(r"[-_]+")
 
 
 def _http_timeout(value: Any, default: float = 2.0) -> float:
@@ -19,19 +27,56 @@ def _http_timeout(value: Any, default: float = 2.0) -> float:
         return default
 
 
+@functools.lru_cache(maxsize=None)
 def companion_log_path() -> Path:
+    # Resolved (and its directory created) once per process.
     state_home = Path(os.environ.get("XDG_STATE_HOME", Path.home() / ".local" / "state"))
     log_dir = state_home / "audiorouter"
     log_dir.mkdir(parents=True, exist_ok=True)
     return log_dir / "companion-sync.log"
 
 
+LOG_MAX_BYTES = 512_000
+LOG_BACKUP_COUNT = 3
+
+
+@functools.lru_cache(maxsize=None)
+def _logger() -> logging.Logger:
+    """
+    File logger for Companion sync. Records go through a queue to a listener
+    thread that keeps the rotating log file open, so callers never block on
+    open/write/close.
+    """
+    import logging
+    import logging.handlers
+    import queue
+
+    logger = logging.getLogger("audiorouter.companion")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    handler = logging.handlers.RotatingFileHandler(
+        companion_log_path(),
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    # asctime goes through C-level time.strftime, no datetime per record.
+    handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+
+    log_queue: queue.Queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    # Drain pending lines before a short-lived CLI process exits.
+    atexit.register(listener.stop)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return logger
+
+
 def _log_line(message: str) -> None:
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{ts}] {message}\n"
     try:
-        with companion_log_path().open("a", encoding="utf-8") as f:
-            f.write(line)
+        _logger().info(message)
     except Exception:
         # logging must never break audio control
         pass
@@ -44,34 +89,99 @@ def companion_enabled(cfg: Dict[str, Any]) -> bool:
     return bool(comp.get("enabled")) and bool(str(comp.get("url", "")).strip())
 
 
+@functools.lru_cache(maxsize=256)
 def sink_key_from_name(sink_name: str) -> str:
     name = (sink_name or "").strip()
     if name.startswith("vsink."):
         name = name[6:]
-    parts = [p for p in name.replace("_", "-").split("-") if p]
+    parts = [p for p in _KEY_SPLIT_RE.split(name) if p]
     if not parts:
         return "sink"
     return parts[0].lower() + "".join(p[:1].upper() + p[1:] for p in parts[1:])
 
 
-def _build_url(base_url: str, var_name: str, value: str) -> str:
-    base = base_url.rstrip("/")
+def _var_endpoint(var_name: str, value: str) -> str:
     path_var = urllib.parse.quote(var_name, safe="")
     q_val = urllib.parse.quote(str(value), safe="")
-    return f"{base}/api/custom-variable/{path_var}/value?value={q_val}"
+    return f"/api/custom-variable/{path_var}/value?value={q_val}"
 
 
-def _post_var(base_url: str, var_name: str, value: str, timeout_s: float) -> str:
-    url = _build_url(base_url, var_name, value)
-    req = urllib.request.Request(url=url, method="POST")
+@functools.lru_cache(maxsize=16)
+def _split_base_url(base_url: str) -> Tuple[str, int, bool, str] | None:
+    """
+    Parse the configured Companion URL once into (host, port, https, path).
+    Returns None when it is not a usable http(s) URL.
+    """
     try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as res:
-            code = getattr(res, "status", 200)
-        return f"OK {code} POST {url}"
-    except urllib.error.HTTPError as exc:
-        return f"HTTP_ERROR {exc.code} POST {url} ({exc.reason})"
-    except Exception as exc:
-        return f"ERROR POST {url} ({exc})"
+        parts = urllib.parse.urlsplit(base_url.rstrip("/"))
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None
+    https = parts.scheme == "https"
+    return parts.hostname, port or (443 if https else 80), https, parts.path
+
+
+def _open_connection(key: Tuple[str, int, bool], timeout_s: float) -> http.client.HTTPConnection:
+    import http.client
+
+    host, port, https = key
+    cls = http.client.HTTPSConnection if https else http.client.HTTPConnection
+    return cls(host, port, timeout=timeout_s)
+
+
+def _post_var(
+    conns: Dict[Tuple[str, int, bool], http.client.HTTPConnection],
+    base_url: str,
+    var_name: str,
+    value: str,
+    timeout_s: float,
+) -> str:
+    """
+    POST one variable. ``conns`` holds the caller's keep-alive connections,
+    so the updates of one push share a single socket per host.
+    """
+    import http.client
+
+    endpoint = _var_endpoint(var_name, value)
+    url = base_url.rstrip("/") + endpoint
+    split = _split_base_url(base_url)
+    if split is None:
+        return f"ERROR POST {url} (invalid companion url)"
+    host, port, https, path = split
+    key = (host, port, https)
+    target = path + endpoint
+    headers = {"Connection": "keep-alive", "Content-Length": "0"}
+
+    for attempt in range(2):
+        conn = conns.get(key)
+        if conn is None:
+            conn = conns[key] = _open_connection(key, timeout_s)
+        try:
+            conn.request("POST", target, headers=headers)
+            res = conn.getresponse()
+            res.read()
+        except (ConnectionError, http.client.BadStatusLine, http.client.CannotSendRequest) as exc:
+            # Server closed the idle keep-alive socket: reconnect once.
+            conns.pop(key, None)
+            conn.close()
+            if attempt == 0:
+                continue
+            return f"ERROR POST {url} ({exc})"
+        except Exception as exc:
+            conns.pop(key, None)
+            conn.close()
+            return f"ERROR POST {url} ({exc})"
+
+        if res.will_close:
+            conns.pop(key, None)
+            conn.close()
+        if res.status >= 400:
+            return f"HTTP_ERROR {res.status} POST {url} ({res.reason})"
+        return f"OK {res.status} POST {url}"
+
+    return f"ERROR POST {url} (no response)"
 
 
 def push_sink_state(
@@ -108,14 +218,21 @@ def push_sink_state(
 
     lines.append(f"SYNC sink={sink_name} key={key} timeout={timeout_s}s")
 
+    updates: List[Tuple[str, str]] = []
     if volume_percent is not None:
         safe_vol = max(0, min(100, int(volume_percent)))
-        var_name = f"{key}{vol_suffix}"
-        lines.append(_post_var(base_url, var_name, str(safe_vol), timeout_s))
-
+        updates.append((f"{key}{vol_suffix}", str(safe_vol)))
     if muted is not None:
-        var_name = f"{key}{mute_suffix}"
-        lines.append(_post_var(base_url, var_name, "1" if muted else "0", timeout_s))
+        updates.append((f"{key}{mute_suffix}", "1" if muted else "0"))
+
+    # One after another over one keep-alive connection: a single connect
+    # (and TLS handshake) per push instead of one per variable.
+    conns: Dict[Tuple[str, int, bool], http.client.HTTPConnection] = {}
+    try:
+        lines.extend(_post_var(conns, base_url, var_name, value, timeout_s) for var_name, value in updates)
+    finally:
+        for conn in conns.values():
+            conn.close()
 
     for ln in lines:
         _log_line(ln)
@@ -132,17 +249,36 @@ def companion_defaults() -> Dict[str, Any]:
     }
 
 
+_COMPANION_KEYS = ("enabled", "url", "volume_suffix", "mute_suffix", "timeout_sec")
+
+# Single-slot cache: (fingerprint of raw input, normalized result)
+_LAST_NORMALIZED: Tuple[Any, Dict[str, Any]] | None = None
+
+
 def normalize_companion_config(raw: Any) -> Dict[str, Any]:
+    global _LAST_NORMALIZED
     base = companion_defaults()
     if not isinstance(raw, dict):
         return base
 
+    # Typed fingerprint so e.g. 1 and 1.0 or True and 1 don't collide.
+    key = tuple((k, type(raw.get(k)), raw.get(k)) for k in _COMPANION_KEYS)
+    last = _LAST_NORMALIZED
+    try:
+        if last is not None and last[0] == key:
+            return dict(last[1])
+    except Exception:
+        key = None
+
     cfg = dict(base)
     cfg["enabled"] = bool(raw.get("enabled", False))
     cfg["url"] = str(raw.get("url", "")).strip()
     cfg["volume_suffix"] = str(raw.get("volume_suffix", "Vol")).strip() or "Vol"
     cfg["mute_suffix"] = str(raw.get("mute_suffix", "Mute")).strip() or "Mute"
     cfg["timeout_sec"] = _http_timeout(raw.get("timeout_sec", 2.0), 2.0)
+
+    if key is not None:
+        _LAST_NORMALIZED = (key, dict(cfg))
     return cfg
 
 
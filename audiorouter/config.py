@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
 import os
+import tempfile
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from .companion import normalize_companion_config
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
 CONFIG_DIR = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")) / "audiorouter"
 STATE_DIR = Path(os.environ.get("XDG_STATE_HOME", Path.home() / ".local" / "state")) / "audiorouter"
 
@@ -29,18 +37,102 @@ DEFAULT_CONFIG = {
 }
 
 
+_DIRS_READY = False
+
+
 def ensure_dirs() -> None:
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     STATE_DIR.mkdir(parents=True, exist_ok=True)
+    _DIRS_READY = True
+
+
+# path -> (st_mtime_ns, st_size, parsed JSON). Lets the daemon re-run
+# load_config()/load_state() on every event without re-parsing unchanged files.
+_CACHE: Dict[Path, Tuple[int, int, Any]] = {}
 
 
 def _read_json(path: Path, fallback: Any) -> Any:
     try:
-        if path.exists():
-            return json.loads(path.read_text(encoding="utf-8"))
+        st = os.stat(path)
+    except OSError:
+        _CACHE.pop(path, None)
+        return fallback
+
+    cached = _CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return copy.deepcopy(cached[2])
+
+    try:
+        raw = path.read_bytes()
+        # Both parsers accept UTF-8 bytes directly, skipping a decode pass.
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     except Exception:
-        pass
-    return fallback
+        _CACHE.pop(path, None)
+        return fallback
+
+    _CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return copy.deepcopy(data)
+
+
+# path -> (st_mtime_ns, st_size, blake2b digest) of the last payload we wrote.
+_LAST_HASH: Dict[Path, Tuple[int, int, bytes]] = {}
+
+
+def _dumps(data: Any, compact: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data) if compact else orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    if compact:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _write_json(path: Path, data: Any, compact: bool = False) -> None:
+    global _DIRS_READY
+    payload = _dumps(data, compact=compact)
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+
+    # Skip the write when the file on disk is still exactly what we wrote last.
+    last = _LAST_HASH.get(path)
+    if last and last[2] == digest:
+        try:
+            st = os.stat(path)
+            if (st.st_mtime_ns, st.st_size) == last[:2]:
+                return
+        except OSError:
+            pass
+
+    # Write to a unique sibling temp file and rename so readers never see a
+    # torn file, even when the GUI and the daemon save at the same moment.
+    try:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    except FileNotFoundError:
+        # Directory was removed after ensure_dirs() ran once: recreate it.
+        _DIRS_READY = False
+        ensure_dirs()
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        # mkstemp() creates 0600; keep the mode a plain write would have had
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+    st = os.stat(path)
+    _LAST_HASH[path] = (st.st_mtime_ns, st.st_size, digest)
+    _CACHE[path] = (st.st_mtime_ns, st.st_size, copy.deepcopy(data))
 
 
 def _normalize_config(cfg: Dict[str, Any] | None) -> Dict[str, Any]:
@@ -54,12 +146,91 @@ def _normalize_config(cfg: Dict[str, Any] | None) -> Dict[str, Any]:
     }
 
 
+# Struct-of-arrays view of a rule list: parallel tuples of target and
+# casefolded binary/app/app_id needles (None where the rule has no such key).
+CompiledRules = Tuple[Tuple[str, ...], Tuple[Optional[str], ...], Tuple[Optional[str], ...], Tuple[Optional[str], ...]]
+
+_LAST_COMPILED: Dict[str, Tuple[List[Any], CompiledRules]] = {}
+
+
+def _needle(match: Dict[str, Any], key: str) -> Optional[str]:
+    return str(match[key]).casefold() if key in match else None
+
+
+def compile_rules(rules: List[Any], suffix: str = "") -> CompiledRules:
+    """
+    Pre-process stream rules once per config change. ``suffix`` is appended to
+    each target (".monitor" for mic routes, which target a bus monitor source).
+    """
+    last = _LAST_COMPILED.get(suffix)
+    if last is not None and last[0] == rules:
+        return last[1]
+
+    targets: List[str] = []
+    bins: List[Optional[str]] = []
+    apps: List[Optional[str]] = []
+    aids: List[Optional[str]] = []
+    for r in rules:
+        if not isinstance(r, dict):
+            continue
+        tgt = str(r.get("target_bus") or "").strip()
+        if not tgt:
+            continue
+        match = r.get("match", {})
+        match = match if isinstance(match, dict) else {}
+        targets.append(f"{tgt}{suffix}")
+        bins.append(_needle(match, "binary"))
+        apps.append(_needle(match, "app"))
+        aids.append(_needle(match, "app_id"))
+
+    compiled: CompiledRules = (tuple(targets), tuple(bins), tuple(apps), tuple(aids))
+    _LAST_COMPILED[suffix] = (copy.deepcopy(rules), compiled)
+    return compiled
+
+
+# (stat stamp of all config files, normalized config, compiled rules, compiled mic routes)
+_CFG_CACHE: Optional[Tuple[Tuple[Any, ...], Dict[str, Any], CompiledRules, CompiledRules]] = None
+
+
+def _config_stamp() -> Tuple[Any, ...]:
+    stamp = []
+    for path in (CONFIG_PATH, VSINKS_PATH, RULES_PATH, INPUT_RULES_PATH):
+        try:
+            st = os.stat(path)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
 def load_config() -> Dict[str, Any]:
+    global _CFG_CACHE
+    # Fast path for per-event callers: one stat per file, no merge/normalize.
+    stamp = _config_stamp()
+    if _CFG_CACHE is None or _CFG_CACHE[0] != stamp:
+        base = _load_config()
+        _CFG_CACHE = (
+            # Stamp from before the read: an edit landing during the read is
+            # picked up next call. A migration write costs one extra reload.
+            stamp,
+            base,
+            compile_rules(base["rules"]),
+            compile_rules(base["mic_routes"], suffix=".monitor"),
+        )
+
+    cfg = copy.deepcopy(_CFG_CACHE[1])
+    # Derived, never persisted: _normalize_config() drops these keys on save.
+    cfg["_compiled_rules"] = _CFG_CACHE[2]
+    cfg["_compiled_mic_routes"] = _CFG_CACHE[3]
+    return cfg
+
+
+def _load_config() -> Dict[str, Any]:
     ensure_dirs()
 
     # Preferred: split files
-    has_split = VSINKS_PATH.exists() or RULES_PATH.exists() or INPUT_RULES_PATH.exists()
-    if has_split:
+    split_present = [p.exists() for p in (VSINKS_PATH, RULES_PATH, INPUT_RULES_PATH)]
+    if any(split_present):
         legacy = _read_json(CONFIG_PATH, {})
         cfg = _normalize_config({
             "buses": _read_json(VSINKS_PATH, []),
@@ -72,7 +243,7 @@ def load_config() -> Dict[str, Any]:
             "companion": legacy.get("companion", None) if isinstance(legacy, dict) else None,
         })
         # Only sync files when split migration is incomplete.
-        if not (VSINKS_PATH.exists() and RULES_PATH.exists() and INPUT_RULES_PATH.exists()):
+        if not all(split_present):
             save_config(cfg)
         return cfg
 
@@ -86,7 +257,7 @@ def load_config() -> Dict[str, Any]:
         return cfg
 
     save_config(DEFAULT_CONFIG)
-    return dict(DEFAULT_CONFIG)
+    return copy.deepcopy(DEFAULT_CONFIG)
 
 
 def save_config(cfg: Dict[str, Any]) -> None:
@@ -95,19 +266,26 @@ def save_config(cfg: Dict[str, Any]) -> None:
     normalized = _normalize_config(cfg)
 
     # Keep both split files and legacy config in sync.
-    VSINKS_PATH.write_text(json.dumps(normalized["buses"], indent=2), encoding="utf-8")
-    RULES_PATH.write_text(json.dumps(normalized["rules"], indent=2), encoding="utf-8")
-    INPUT_RULES_PATH.write_text(json.dumps(normalized["input_routes"], indent=2), encoding="utf-8")
-    CONFIG_PATH.write_text(json.dumps(normalized, indent=2), encoding="utf-8")
+    _write_json(VSINKS_PATH, normalized["buses"])
+    _write_json(RULES_PATH, normalized["rules"])
+    _write_json(INPUT_RULES_PATH, normalized["input_routes"])
+    _write_json(CONFIG_PATH, normalized)
 
 
 def load_state() -> Dict[str, Any]:
     ensure_dirs()
-    if not STATE_PATH.exists():
-        save_state({})
-    return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    # Hot path is a single stat inside _read_json; only a miss looks closer.
+    st = _read_json(STATE_PATH, None)
+    if st is None:
+        if not STATE_PATH.exists():
+            save_state({})
+            return {}
+        # Keep previous behaviour: a corrupt state file is an error, not {}.
+        return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    return st
 
 
 def save_state(st: Dict[str, Any]) -> None:
     ensure_dirs()
-    STATE_PATH.write_text(json.dumps(st, indent=2), encoding="utf-8")
+    # state.json is internal (never hand-edited), so skip the indentation.
+    _write_json(STATE_PATH, st, compact=True)
@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import copy
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Container, Iterator
 
 VIRTUAL_SWITCH_MUTE_SEC = 0.12
 PHYSICAL_SWITCH_MUTE_SEC = 0.05
 SYSTEM_STREAM_MOVE_MUTE_SEC = 0.0
+# Handover polls: each poll is one list call, which forks pactl without the
+# native client, so poll tightly only when that is cheap.
+PACTL_POLL_SEC = 0.02
+SYSTEM_BUS = "vsink.system"
+
+# Our own null sinks; compared by slice (fixed-length prefix) in hot loops.
+VSINK_PREFIX = "vsink."
+_VSINK_LEN = len(VSINK_PREFIX)
 
 """
 Core logic for audiorouter.
@@ -19,21 +32,21 @@ Fixes:
 - Route handover mutes bus sink + loopback sink-input to reduce switch artifacts
 """
 
-from .config import load_config, load_state, save_state
+from .config import CompiledRules, compile_rules, load_config, load_state, save_state
 from . import pactl as pa
 
 
-def _get_physical_default_sink() -> str | None:
-    default = pa.get_default_sink()
+def _get_physical_default_sink(snap: dict | None = None) -> str | None:
+    default = snap["default_sink"] if snap else pa.get_default_sink()
 
     # If default is already physical → use it
-    if default and not default.startswith("vsink."):
+    if default and default[:_VSINK_LEN] != VSINK_PREFIX:
         return default
 
     # Otherwise find first real hardware sink
-    for s in pa.list_sinks():
-        name = s.get("name")
-        if name and not name.startswith("vsink."):
+    names = snap["sinks"] if snap else [s.get("name") for s in pa.list_sinks()]
+    for name in names:
+        if name and name[:_VSINK_LEN] != VSINK_PREFIX:
             return name
 
     return default
@@ -45,40 +58,211 @@ def _is_system_stream(props: dict) -> bool:
     Heuristic classification for short system sounds/notifications so they can
     be routed to the system bus immediately.
     """
-    role = (props.get("media.role") or "").lower()
-    if role in {"event", "notification"}:
+    role = props.get("media.role") or ""
+    # Clients set the role in lower case; skip reading the rest for them.
+    if role in _SYSTEM_ROLES:
         return True
-
-    app = (props.get("application.name") or "").lower()
-    binary = (props.get("application.process.binary") or "").lower()
-    app_id = (props.get("pipewire.access.portal.app_id") or "").lower()
-    media_name = (props.get("media.name") or "").lower()
-
-    known_apps = {
-        "gnome-shell",
-        "plasmashell",
-        "kded5",
-        "kded6",
-        "xfce4-notifyd",
-        "notification-daemon",
-        "mako",
-    }
-    known_bins = {
-        "gnome-shell",
-        "plasmashell",
-        "xfce4-notifyd",
-        "notification-daemon",
-        "mako",
-        "canberra-gtk-play",
-    }
-
-    if app in known_apps or binary in known_bins:
+    return _classify_system_stream(
+        role,
+        props.get("application.name") or "",
+        props.get("application.process.binary") or "",
+        props.get("pipewire.access.portal.app_id") or "",
+        props.get("media.name") or "",
+    )
+
+
+_SYSTEM_ROLES = frozenset({"event", "notification"})
+_SYSTEM_APPS = frozenset({
+    "gnome-shell",
+    "plasmashell",
+    "kded5",
+    "kded6",
+    "xfce4-notifyd",
+    "notification-daemon",
+    "mako",
+})
+_SYSTEM_BINS = frozenset({
+    "gnome-shell",
+    "plasmashell",
+    "xfce4-notifyd",
+    "notification-daemon",
+    "mako",
+    "canberra-gtk-play",
+})
+# One case-insensitive scan of media.name: group 1 = system-sound tokens,
+# group 2 = "portal" (only counts for xdg-desktop-portal streams).
+_SYSTEM_MEDIA_RE = re.compile("(system sound|systemklänge|benachrichtigung|notification|event)|(portal)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def _classify_system_stream(role: str, app: str, binary: str, app_id: str, media_name: str) -> bool:
+    # Same streams show up on every pass; cache on the raw prop values.
+    if role and role.casefold() in _SYSTEM_ROLES:
         return True
 
-    if app_id.startswith("org.freedesktop.impl.portal") and "portal" in media_name:
+    if (app and app.casefold() in _SYSTEM_APPS) or (binary and binary.casefold() in _SYSTEM_BINS):
         return True
 
-    return any(token in media_name for token in {"system sound", "system sounds", "systemklänge", "benachrichtigung", "notification", "event"})
+    if not media_name:
+        return False
+
+    portal_app = None
+    for m in _SYSTEM_MEDIA_RE.finditer(media_name):
+        if m.group(1):
+            return True
+        if portal_app is None:
+            portal_app = app_id.casefold().startswith("org.freedesktop.impl.portal")
+        if portal_app:
+            return True
+    return False
+
+
+def _matching_targets(compiled: CompiledRules, existing_targets: Container[str], props: dict) -> Iterator[str]:
+    """
+    Yield, in rule order, the targets of compiled rules that exist and whose
+    needles all match the stream's binary/app/app_id props.
+    """
+    hits = _rule_hits(
+        compiled,
+        props.get("application.process.binary") or "",
+        props.get("application.name") or "",
+        props.get("pipewire.access.portal.app_id") or "",
+    )
+    for tgt in hits:
+        if tgt in existing_targets:
+            yield tgt
+
+
+@lru_cache(maxsize=512)
+def _rule_hits(compiled: CompiledRules, bin_: str, app: str, aid: str) -> tuple[str, ...]:
+    # Rules are substring matches, so they cannot be bucketed by exact key;
+    # instead index the outcome by the stream's raw (binary, app, app_id),
+    # which repeats across streams of one app and across passes. Needles are
+    # casefolded once in compile_rules(), the stream fields only on a miss.
+    bin_, app, aid = bin_.casefold(), app.casefold(), aid.casefold()
+    targets, bins, apps, aids = compiled
+    return tuple(
+        tgt
+        for tgt, m_bin, m_app, m_aid in zip(targets, bins, apps, aids)
+        if (m_bin is None or m_bin in bin_)
+        and (m_app is None or m_app in app)
+        and (m_aid is None or m_aid in aid)
+    )
+
+
+def _refresh_modules(snap: dict) -> None:
+    snap["modules"] = pa.list_modules()
+    snap["modules_by_id"] = {m["id"]: m for m in snap["modules"]}
+    snap.pop("loopbacks", None)
+    # loading/unloading loopbacks adds/removes sink-inputs
+    snap.pop("sink_inputs", None)
+
+
+def _sink_inputs(snap: dict) -> list:
+    """Sink-inputs for this pass, listed at most once between module changes."""
+    if "sink_inputs" not in snap:
+        snap["sink_inputs"] = pa.list_sink_inputs()
+    return snap["sink_inputs"]
+
+
+def _loopbacks(snap: dict) -> dict[str, dict[str, str]]:
+    """Loopback index (source -> {sink: module_id}) for the current module list."""
+    if "loopbacks" not in snap:
+        snap["loopbacks"] = pa.loopback_index(snap["modules"])
+    return snap["loopbacks"]
+
+
+def _unload_wrong_loopbacks(snap: dict, source_name: str, wanted_sink: str) -> bool:
+    """Unload loopbacks from source_name to any sink but wanted_sink; True if any were."""
+    wrong = [mid for sink, mid in _loopbacks(snap).get(source_name, {}).items() if sink != wanted_sink]
+    for mid in wrong:
+        pa.unload_module(mid)
+    return bool(wrong)
+
+
+def _owned_loopback_intact(snap: dict, module_id: str, source_name: str, sink_name: str) -> bool:
+    """
+    O(1) steady-state check: the loopback we recorded in state still exists and
+    still connects source_name -> sink_name, so nothing needs scanning/cleanup.
+    """
+    m = snap["modules_by_id"].get(str(module_id or ""))
+    if not m or m.get("name") != "module-loopback":
+        return False
+    args = pa.module_args(m.get("args", ""))
+    return args.get("source") == source_name and args.get("sink") == sink_name
+
+
+def _handover_poll_sec(native_sec: float) -> float:
+    return native_sec if pa.native_available() else PACTL_POLL_SEC
+
+
+def _wait_loopback_ready(module_id: str, max_wait_sec: float) -> list[str]:
+    """
+    Hold the handover mute only until the new loopback's sink-input shows up
+    (it is carrying audio from then on), capped at the old fixed mute window.
+    Returns the loopback's sink-input ids, or [] on timeout.
+    """
+    deadline = time.monotonic() + max_wait_sec
+    poll_sec = _handover_poll_sec(0.005)
+    while True:
+        inputs = pa.sink_inputs_for_owner_module(module_id)
+        if inputs or time.monotonic() >= deadline:
+            return inputs
+        time.sleep(poll_sec)
+
+
+def _wait_inputs_gone(sink_input_ids: list[str], max_wait_sec: float) -> None:
+    """
+    After unloading a loopback: return once its sink-inputs are no longer
+    listed, capped at max_wait_sec (the whole cap if we don't know them).
+    """
+    if not sink_input_ids:
+        time.sleep(max_wait_sec)
+        return
+    gone = set(sink_input_ids)
+    deadline = time.monotonic() + max_wait_sec
+    poll_sec = _handover_poll_sec(0.002)
+    while True:
+        if not any(i.get("id") in gone for i in pa.list_sink_inputs()) or time.monotonic() >= deadline:
+            return
+        time.sleep(poll_sec)
+
+
+def _handover_bus(name: str, monitor: str, target: str, prev_target: str, prev_inputs: list[str], modules: list) -> str:
+    """
+    Move bus ``name`` from its previous loopback to ``monitor -> target`` while
+    muted. ``prev_inputs`` are the old loopback's sink-inputs and ``modules``
+    a read-only module list, both from the pass snapshot.
+    Returns the new loopback module id.
+    """
+    involves_virtual = VSINK_PREFIX in (target[:_VSINK_LEN], prev_target[:_VSINK_LEN])
+
+    # Mute the bus sink itself (not only the monitor source) to avoid audible pops
+    # while loopback modules are recreated. Also mute sink-inputs owned by the old
+    # loopback module when we can resolve them.
+    pa.set_mute_many(True, sinks=[name], sources=[monitor], sink_inputs=prev_inputs)
+
+    new_mod = ""
+    new_inputs: list[str] = []
+    try:
+        if involves_virtual:
+            # For virtual-bus handover use break-before-make while muted to avoid
+            # comb/feedback-like artifacts when jumping between vsinks.
+            if pa.cleanup_wrong_loopbacks_for_source(monitor, target, modules):
+                _wait_inputs_gone(prev_inputs, 0.02)
+            new_mod = pa.load_loopback(monitor, target, latency_msec=30)
+            new_inputs = _wait_loopback_ready(new_mod, VIRTUAL_SWITCH_MUTE_SEC)
+        else:
+            # For physical outputs keep make-before-break and a shorter mute window.
+            new_mod = pa.load_loopback(monitor, target, latency_msec=30, replace=True, modules=modules)
+            new_inputs = _wait_loopback_ready(new_mod, PHYSICAL_SWITCH_MUTE_SEC)
+    finally:
+        # Ensure we never leave loopback inputs muted after the transition.
+        if new_mod and not new_inputs:
+            new_inputs = pa.sink_inputs_for_owner_module(new_mod)
+        pa.set_mute_many(False, sinks=[name], sources=[monitor], sink_inputs=[*prev_inputs, *new_inputs])
+
+    return new_mod
 
 
 def _move_input_quietly(sink_input_id: str, target_sink: str, mute_sec: float = 0.0) -> None:
@@ -100,74 +284,83 @@ def _move_input_quietly(sink_input_id: str, target_sink: str, mute_sec: float =
 
 
 
-def route_sink_input_now(sink_input_id: str) -> bool:
+def _snap_list(snap: dict | None, key: str, fetch) -> Any:
+    """snap[key] if the caller already listed it, else fetch (and remember)."""
+    if snap is None:
+        return fetch()
+    if key not in snap:
+        snap[key] = fetch()
+    return snap[key]
+
+
+def _plan_input(inp: dict, compiled_rules: CompiledRules, existing_sinks: Container[str]) -> tuple[str, bool] | None:
+    """
+    Shared by apply_once() and route_sink_input_now(): where a sink-input
+    belongs, as (sink, matched_by_rule), or None to leave it alone. When
+    several rules match, the last one wins -- where moving once per matching
+    rule in order used to end up.
+    """
+    props = inp.get("props", {})
+    tgt = None
+    for tgt in _matching_targets(compiled_rules, existing_sinks, props):
+        pass
+    if tgt is not None:
+        return tgt, True
+
+    if SYSTEM_BUS in existing_sinks and _is_system_stream(props):
+        return SYSTEM_BUS, False
+    return None
+
+
+def route_sink_input_now(sink_input_id: str, snap: dict | None = None) -> bool:
     """
     Fast path for freshly created sink-inputs: try rule/system routing directly
     by id, before a full apply_once() reconciliation.
+
+    ``snap`` may carry "sink_inputs"/"sinks" already listed by the caller.
+    Without a listing the stream is fetched by id; the sink list is listed
+    once and stored back for the next id.
     """
     sid = str(sink_input_id).strip()
     if not sid:
         return False
 
     cfg = load_config()
-    rules = cfg.get("rules", [])
+    compiled_rules = cfg.get("_compiled_rules") or compile_rules(cfg.get("rules", []))
 
-    target_inp = None
-    for inp in pa.list_sink_inputs():
-        if str(inp.get("id", "")).strip() == sid:
-            target_inp = inp
-            break
+    if snap is not None and "sink_inputs" in snap:
+        target_inp = next((i for i in snap["sink_inputs"] if i.get("id") == sid), None)
+    else:
+        target_inp = pa.get_sink_input(sid)
 
     if not target_inp:
         return False
 
-    props = target_inp.get("props", {})
-    app = (props.get("application.name") or "").lower()
-    bin_ = (props.get("application.process.binary") or "").lower()
-    aid = (props.get("pipewire.access.portal.app_id") or "").lower()
-
-    for r in rules:
-        match = r.get("match", {})
-        tgt = r.get("target_bus")
-
-        if not tgt or not pa.sink_exists(tgt):
-            continue
-
-        ok = True
-        if "binary" in match and match["binary"].lower() not in bin_:
-            ok = False
-        if "app" in match and match["app"].lower() not in app:
-            ok = False
-        if "app_id" in match and match["app_id"].lower() not in aid:
-            ok = False
-
-        if ok:
-            try:
-                pa.move_sink_input(sid, tgt)
-                return True
-            except Exception:
-                return False
-
-    system_bus = "vsink.system"
-    if pa.sink_exists(system_bus) and _is_system_stream(props):
-        sink_id = str(target_inp.get("sink_id", "")).strip()
-        sink_name_by_id = {str(s.get("id", "")).strip(): str(s.get("name", "")) for s in pa.list_sinks()}
-        if sink_name_by_id.get(sink_id, "") == system_bus:
-            return True
-        try:
-            _move_input_quietly(sid, system_bus, mute_sec=SYSTEM_STREAM_MOVE_MUTE_SEC)
-            return True
-        except Exception:
-            return False
+    existing_sinks = _snap_list(snap, "sinks", pa.sink_ids)
+    plan = _plan_input(target_inp, compiled_rules, existing_sinks)
+    if plan is None:
+        return False
 
-    return False
+    tgt, by_rule = plan
+    # Already where it belongs (e.g. placed by module-intended-roles).
+    if existing_sinks[tgt] == target_inp.get("sink_id"):
+        return True
+    try:
+        if by_rule:
+            pa.move_sink_input(sid, tgt)
+        else:
+            _move_input_quietly(sid, tgt, mute_sec=SYSTEM_STREAM_MOVE_MUTE_SEC)
+        return True
+    except Exception:
+        return False
 
 
 
-def route_source_output_now(source_output_id: str) -> bool:
+def route_source_output_now(source_output_id: str, snap: dict | None = None) -> bool:
     """
     Fast path for freshly created source-outputs (record/capture streams).
     Routes microphone input streams to configured target monitor sources.
+    ``snap`` works like in route_sink_input_now ("source_outputs"/"sources").
     """
     sid = str(source_output_id).strip()
     if not sid:
@@ -178,56 +371,83 @@ def route_source_output_now(source_output_id: str) -> bool:
     if not mic_routes:
         return False
 
-    target_out = None
-    for out in pa.list_source_outputs():
-        if str(out.get("id", "")).strip() == sid:
-            target_out = out
-            break
+    if snap is not None and "source_outputs" in snap:
+        target_out = next((o for o in snap["source_outputs"] if o.get("id") == sid), None)
+    else:
+        target_out = pa.get_source_output(sid)
 
     if not target_out:
         return False
 
     props = target_out.get("props", {})
-    app = (props.get("application.name") or "").lower()
-    bin_ = (props.get("application.process.binary") or "").lower()
-    aid = (props.get("pipewire.access.portal.app_id") or "").lower()
-
-    for r in mic_routes:
-        match = r.get("match", {})
-        tgt_bus = (r.get("target_bus") or "").strip()
-        if not tgt_bus:
-            continue
+    existing_sources = _snap_list(snap, "sources", pa.source_ids)
 
-        target_source = f"{tgt_bus}.monitor"
-        if not pa.source_exists(target_source):
-            continue
+    compiled = cfg.get("_compiled_mic_routes") or compile_rules(mic_routes, suffix=".monitor")
+    target_source = next(_matching_targets(compiled, existing_sources, props), None)
+    if target_source:
+        if existing_sources[target_source] == target_out.get("source_id"):
+            return True
+        try:
+            pa.move_source_output(sid, target_source)
+            return True
+        except Exception:
+            return False
 
-        ok = True
-        if "binary" in match and match["binary"].lower() not in bin_:
-            ok = False
-        if "app" in match and match["app"].lower() not in app:
-            ok = False
-        if "app_id" in match and match["app_id"].lower() not in aid:
-            ok = False
+    return False
 
-        if ok:
-            try:
-                pa.move_source_output(sid, target_source)
-                return True
-            except Exception:
-                return False
+_LAST_PASS_SIGNATURE: tuple | None = None
+# Sink id of the system bus whose role metadata this process already set.
+_SYSTEM_SINK_TAGGED: str | None = None
+
+
+def _state_table(st: dict, key: str) -> dict[str, str]:
+    table = st.get(key)
+    if not isinstance(table, dict):
+        table = {}
+    st[key] = table = {str(k): str(v or "") for k, v in table.items()}
+    return table
+
+
+# Stream props that rules and the system-sound heuristic look at; a client
+# may set them after creation (a "change" event), which must not be skipped.
+_MATCHED_PROPS = (
+    "application.process.binary",
+    "application.name",
+    "pipewire.access.portal.app_id",
+    "media.role",
+    "media.name",
+)
+
+
+def _stream_signature(stream: dict, placement_key: str) -> tuple:
+    props = stream.get("props", {})
+    return (stream.get("id"), stream.get(placement_key), tuple(props.get(k) for k in _MATCHED_PROPS))
+
+
+def _world_signature(snap: dict) -> tuple:
+    """Everything apply_once() reacts to on the server side, as a comparable value."""
+    return (
+        snap["default_sink"],
+        tuple(snap["sinks"].items()),
+        tuple(snap["sources"].items()),
+        tuple((m["id"], m["name"], m.get("args", "")) for m in snap["modules"]),
+        tuple(_stream_signature(i, "sink_id") for i in _sink_inputs(snap)),
+        tuple(_stream_signature(o, "source_id") for o in snap.get("source_outputs", ())),
+    )
 
-    return False
 
 def apply_once() -> None:
     cfg = load_config()
     st = load_state()
+    st_loaded = copy.deepcopy(st)
 
-    st.setdefault("bus_modules", {})     # bus_name -> module_id (null-sink)
-    st.setdefault("route_modules", {})   # bus_name -> module_id (loopback) (optional)
-    st.setdefault("route_target", {})    # bus_name -> last target sink
-    st.setdefault("input_route_modules", {})  # source_name -> module_id
-    st.setdefault("input_route_target", {})   # source_name -> target sink
+    # Bind each per-bus table once and coerce ids/targets to str up front, so
+    # the loops below do one plain dict lookup per access.
+    bus_modules = _state_table(st, "bus_modules")                  # bus_name -> module_id (null-sink)
+    route_modules = _state_table(st, "route_modules")              # bus_name -> module_id (loopback) (optional)
+    route_target = _state_table(st, "route_target")                # bus_name -> last target sink
+    input_route_modules = _state_table(st, "input_route_modules")  # source_name -> module_id
+    input_route_target = _state_table(st, "input_route_target")    # source_name -> target sink
 
     buses = cfg.get("buses", [])
     rules = cfg.get("rules", [])
@@ -238,58 +458,87 @@ def apply_once() -> None:
     wanted_input_sources = {str(r.get("source", "")).strip() for r in input_routes if str(r.get("source", "")).strip()}
 
     # cleanup stale input-route state entries
-    for source_name in list(st["input_route_modules"].keys()):
+    for source_name in list(input_route_modules.keys()):
         if source_name not in wanted_input_sources:
-            pa.unload_module(st["input_route_modules"][source_name])
-            st["input_route_modules"].pop(source_name, None)
-            st["input_route_target"].pop(source_name, None)
+            pa.unload_module(input_route_modules[source_name])
+            input_route_modules.pop(source_name, None)
+            input_route_target.pop(source_name, None)
 
     # ---------------------------------------------------------
     # 1) Cleanup removed buses
     # ---------------------------------------------------------
-    for bus_name in list(st["route_modules"].keys()):
+    for bus_name in list(route_modules.keys()):
         if bus_name not in current_bus_names:
-            pa.unload_module(st["route_modules"][bus_name])
-            st["route_modules"].pop(bus_name, None)
-            st["route_target"].pop(bus_name, None)
+            pa.unload_module(route_modules[bus_name])
+            route_modules.pop(bus_name, None)
+            route_target.pop(bus_name, None)
 
-    for bus_name in list(st["bus_modules"].keys()):
+    for bus_name in list(bus_modules.keys()):
         if bus_name not in current_bus_names:
-            pa.unload_module(st["bus_modules"][bus_name])
-            st["bus_modules"].pop(bus_name, None)
+            pa.unload_module(bus_modules[bus_name])
+            bus_modules.pop(bus_name, None)
+
+    # One read of sinks/sources/modules for the rest of the pass; refreshed
+    # only after we load/unload something ourselves.
+    snap = pa.snapshot()
+    snap["modules_by_id"] = {m["id"]: m for m in snap["modules"]}
+
+    # Same config, same state and the server looks exactly like it did when
+    # the previous pass ran to completion: that pass already reconciled it.
+    global _LAST_PASS_SIGNATURE, _SYSTEM_SINK_TAGGED
+    if mic_routes:
+        snap["source_outputs"] = pa.list_source_outputs()
+    signature = (cfg, st_loaded, _world_signature(snap))
+    if signature == _LAST_PASS_SIGNATURE:
+        if st != st_loaded:
+            save_state(st)
+        return
+    _LAST_PASS_SIGNATURE = None
 
     # ---------------------------------------------------------
     # 2) Ensure null sinks exist
     # ---------------------------------------------------------
+    created_sinks = False
     for b in buses:
         name = b["name"]
         label = b.get("label", name)
 
-        if not pa.sink_exists(name):
+        if name not in snap["sinks"]:
             mid = pa.load_null_sink(name, label)
-            st["bus_modules"][name] = mid
+            bus_modules[name] = mid
+            created_sinks = True
 
         # Keep role metadata on existing system sink too (important after upgrades).
-        if name == "vsink.system":
-            pa.tag_system_sink(name)
+        # Once per sink instance is enough; load_null_sink() tags fresh ones.
+        if name == SYSTEM_BUS and name in snap["sinks"] and snap["sinks"][name] != _SYSTEM_SINK_TAGGED:
+            pa.tag_system_sink(name, snap["sinks"])
+            _SYSTEM_SINK_TAGGED = snap["sinks"][name]
+
+    if created_sinks:
+        # new null sinks add no streams; keep the stream listings we have
+        listed = {k: snap[k] for k in ("sink_inputs", "source_outputs") if k in snap}
+        snap = pa.snapshot()
+        snap["modules_by_id"] = {m["id"]: m for m in snap["modules"]}
+        snap.update(listed)
 
     # ---------------------------------------------------------
     # 3) Routing logic (NO LOOPBACK CHURN)
     # ---------------------------------------------------------
+    handovers: list[tuple[str, str, str, str, str]] = []
     for b in buses:
         name = b["name"]
         route_to = b.get("route_to", "default")
 
         # Resolve target safely
         if str(route_to).strip().lower() in {"none", "no routing"}:
-            prev_mod = str(st["route_modules"].get(name, "") or "")
+            prev_mod = route_modules.get(name, "")
             if prev_mod:
                 pa.unload_module(prev_mod)
-            st["route_modules"].pop(name, None)
-            st["route_target"][name] = "none"
+            route_modules.pop(name, None)
+            route_target[name] = "none"
             continue
 
-        target = _get_physical_default_sink() if route_to == "default" else route_to
+        target = _get_physical_default_sink(snap) if route_to == "default" else route_to
         if not target:
             continue
 
@@ -300,55 +549,54 @@ def apply_once() -> None:
         monitor = f"{name}.monitor"
 
         # PipeWire may create monitor shortly after sink
-        if not pa.source_exists(monitor):
+        if monitor not in snap["sources"]:
+            continue
+
+        # Nothing changed since last pass and our loopback is still there:
+        # skip the module scan and wrong-loopback cleanup entirely.
+        if route_target.get(name) == target and _owned_loopback_intact(
+            snap, route_modules.get(name, ""), monitor, target
+        ):
             continue
 
         # ✅ If correct loopback already exists: keep it, do nothing
-        if pa.loopback_exists(monitor, target):
-            st["route_target"][name] = target
+        if target in _loopbacks(snap).get(monitor, ()):
+            route_target[name] = target
             # Optional: remove wrong ones (same source -> other sink)
-            pa.cleanup_wrong_loopbacks_for_source(monitor, target)
+            if _unload_wrong_loopbacks(snap, monitor, target):
+                _refresh_modules(snap)
             continue
 
-        prev_target = st["route_target"].get(name, "")
-        prev_mod = str(st["route_modules"].get(name, "") or "")
-        involves_virtual = target.startswith("vsink.") or str(prev_target).startswith("vsink.")
-
-        # Mute the bus sink itself (not only the monitor source) to avoid audible pops
-        # while loopback modules are recreated. Also mute sink-inputs owned by the old
-        # loopback module when we can resolve them.
-        prev_inputs = pa.sink_inputs_for_owner_module(prev_mod)
-        pa.set_sink_mute(name, True)
-        pa.set_source_mute(monitor, True)
-        for sid in prev_inputs:
-            pa.set_sink_input_mute(sid, True)
-
-        new_mod = ""
+        prev_target = route_target.get(name, "")
+        prev_mod = route_modules.get(name, "")
+        handovers.append((name, monitor, target, prev_target, prev_mod))
+
+    # Each handover only touches its own bus sink/monitor and loopbacks whose
+    # source is that monitor, so they can run side by side; state is merged
+    # here on the calling thread.
+    if handovers:
+        modules = list(snap["modules"])
+        inputs_by_owner: dict[str, list[str]] = {}
+        for inp in _sink_inputs(snap):
+            owner = inp.get("owner_module")
+            if owner:
+                inputs_by_owner.setdefault(str(owner), []).append(str(inp.get("id", "")))
+        jobs = [
+            (name, monitor, target, prev_target, inputs_by_owner.get(prev_mod, []) if prev_mod else [], modules)
+            for name, monitor, target, prev_target, prev_mod in handovers
+        ]
         try:
-            if involves_virtual:
-                # For virtual-bus handover use break-before-make while muted to avoid
-                # comb/feedback-like artifacts when jumping between vsinks.
-                pa.cleanup_wrong_loopbacks_for_source(monitor, target)
-                time.sleep(0.02)
-                new_mod = pa.load_loopback(monitor, target, latency_msec=30)
-                time.sleep(VIRTUAL_SWITCH_MUTE_SEC)
+            if len(jobs) == 1:
+                results = [_handover_bus(*jobs[0])]
             else:
-                # For physical outputs keep make-before-break and a shorter mute window.
-                new_mod = pa.load_loopback(monitor, target, latency_msec=30)
-                pa.cleanup_wrong_loopbacks_for_source(monitor, target)
-                time.sleep(PHYSICAL_SWITCH_MUTE_SEC)
+                with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as ex:
+                    results = list(ex.map(lambda job: _handover_bus(*job), jobs))
         finally:
-            # Ensure we never leave loopback inputs muted after the transition.
-            for sid in prev_inputs:
-                pa.set_sink_input_mute(sid, False)
-            if new_mod:
-                for sid in pa.sink_inputs_for_owner_module(new_mod):
-                    pa.set_sink_input_mute(sid, False)
-            pa.set_source_mute(monitor, False)
-            pa.set_sink_mute(name, False)
-
-        st["route_modules"][name] = new_mod
-        st["route_target"][name] = target
+            _refresh_modules(snap)
+
+        for (name, _monitor, target, _prev_target, _prev_mod), new_mod in zip(handovers, results):
+            route_modules[name] = new_mod
+            route_target[name] = target
 
     # ---------------------------------------------------------
     # 4) Apply input device routes (source -> bus sink)
@@ -358,33 +606,43 @@ def apply_once() -> None:
         tgt_bus = str(r.get("target_bus", "")).strip()
         if not source_name or not tgt_bus:
             continue
-        if not pa.source_exists(source_name) or not pa.sink_exists(tgt_bus):
+        if source_name not in snap["sources"] or tgt_bus not in snap["sinks"]:
             continue
 
         # avoid routing monitor sources or self-like targets
         if source_name.endswith(".monitor"):
             continue
 
-        if pa.loopback_exists(source_name, tgt_bus):
-            st["input_route_target"][source_name] = tgt_bus
-            pa.cleanup_wrong_loopbacks_for_source(source_name, tgt_bus)
+        if input_route_target.get(source_name) == tgt_bus and _owned_loopback_intact(
+            snap, input_route_modules.get(source_name, ""), source_name, tgt_bus
+        ):
+            continue
+
+        if tgt_bus in _loopbacks(snap).get(source_name, ()):
+            input_route_target[source_name] = tgt_bus
+            if _unload_wrong_loopbacks(snap, source_name, tgt_bus):
+                _refresh_modules(snap)
             continue
 
-        prev_mod = str(st["input_route_modules"].get(source_name, "") or "")
-        prev_target = str(st["input_route_target"].get(source_name, "") or "")
+        prev_mod = input_route_modules.get(source_name, "")
+        prev_target = input_route_target.get(source_name, "")
 
+        modules = snap["modules"]
         if prev_mod and prev_target != tgt_bus:
             pa.unload_module(prev_mod)
+            # gone now: keep load_loopback's cleanup from unloading it again
+            modules = [m for m in modules if m["id"] != prev_mod]
 
         new_mod = ""
         try:
-            pa.cleanup_wrong_loopbacks_for_source(source_name, tgt_bus)
-            new_mod = pa.load_loopback(source_name, tgt_bus, latency_msec=30)
+            new_mod = pa.load_loopback(source_name, tgt_bus, latency_msec=30, replace=True, modules=modules)
         except Exception:
             continue
+        finally:
+            _refresh_modules(snap)
 
-        st["input_route_modules"][source_name] = new_mod
-        st["input_route_target"][source_name] = tgt_bus
+        input_route_modules[source_name] = new_mod
+        input_route_target[source_name] = tgt_bus
 
     # ---------------------------------------------------------
     # 5) Ensure policy modules for role-based placement
@@ -392,101 +650,59 @@ def apply_once() -> None:
     # ---------------------------------------------------------
     # Needed so streams with media.role=event/notification are opened
     # directly on sinks that advertise matching device.intended_roles.
-    pa.ensure_module_loaded("module-intended-roles")
+    pa.ensure_module_loaded("module-intended-roles", modules=snap["modules"])
 
     # ---------------------------------------------------------
     # 6) Apply stream rules
     # ---------------------------------------------------------
-    inputs = pa.list_sink_inputs()
+    inputs = _sink_inputs(snap)
 
-    system_bus = "vsink.system"
-    have_system_bus = pa.sink_exists(system_bus)
-    sink_name_by_id = {str(s.get("id", "")).strip(): str(s.get("name", "")) for s in pa.list_sinks()}
+    existing_sinks = snap["sinks"]
+    compiled_rules = cfg.get("_compiled_rules") or compile_rules(rules)
 
+    # input id -> target sink for rule matches, moved in one batch below
+    moves: dict[str, str] = {}
     for inp in inputs:
-        props = inp.get("props", {})
-        app = (props.get("application.name") or "").lower()
-        bin_ = (props.get("application.process.binary") or "").lower()
-        aid = (props.get("pipewire.access.portal.app_id") or "").lower()
-
-        matched_rule = False
-        for r in rules:
-            match = r.get("match", {})
-            tgt = r.get("target_bus")
+        plan = _plan_input(inp, compiled_rules, existing_sinks)
+        if plan is None:
+            continue
 
-            if not tgt or not pa.sink_exists(tgt):
-                continue
+        tgt, by_rule = plan
+        # compare ids the forward way (name -> id) instead of building id -> name
+        if existing_sinks[tgt] == inp.get("sink_id"):
+            continue
 
-            ok = True
-            if "binary" in match and match["binary"].lower() not in bin_:
-                ok = False
-            if "app" in match and match["app"].lower() not in app:
-                ok = False
-            if "app_id" in match and match["app_id"].lower() not in aid:
-                ok = False
-
-            if ok:
-                matched_rule = True
-                try:
-                    pa.move_sink_input(str(inp["id"]), tgt)
-                except Exception:
-                    pass
-
-        if matched_rule:
+        sid = inp["id"]
+        if by_rule:
+            moves[sid] = tgt
             continue
+        try:
+            _move_input_quietly(sid, tgt, mute_sec=SYSTEM_STREAM_MOVE_MUTE_SEC)
+        except Exception:
+            pass
 
-        if have_system_bus and _is_system_stream(props):
-            sid = str(inp.get("id", ""))
-            sink_id = str(inp.get("sink_id", "")).strip()
-            if sink_name_by_id.get(sink_id, "") == system_bus:
-                continue
-            try:
-                _move_input_quietly(sid, system_bus, mute_sec=SYSTEM_STREAM_MOVE_MUTE_SEC)
-            except Exception:
-                pass
+    pa.move_sink_inputs(moves)
 
     # ---------------------------------------------------------
     # 7) Apply microphone (source-output) routes
     # ---------------------------------------------------------
     if mic_routes:
-        outs = pa.list_source_outputs()
-        src_name_by_id = {str(src.get("id", "")).strip(): str(src.get("name", "")) for src in pa.list_sources()}
+        outs = _snap_list(snap, "source_outputs", pa.list_source_outputs)
+        existing_sources = snap["sources"]
+        compiled_mic_routes = cfg.get("_compiled_mic_routes") or compile_rules(mic_routes, suffix=".monitor")
 
         for out in outs:
             props = out.get("props", {})
-            app = (props.get("application.name") or "").lower()
-            bin_ = (props.get("application.process.binary") or "").lower()
-            aid = (props.get("pipewire.access.portal.app_id") or "").lower()
-
-            for r in mic_routes:
-                match = r.get("match", {})
-                tgt_bus = (r.get("target_bus") or "").strip()
-                if not tgt_bus:
-                    continue
-
-                target_source = f"{tgt_bus}.monitor"
-                if not pa.source_exists(target_source):
-                    continue
-
-                ok = True
-                if "binary" in match and match["binary"].lower() not in bin_:
-                    ok = False
-                if "app" in match and match["app"].lower() not in app:
-                    ok = False
-                if "app_id" in match and match["app_id"].lower() not in aid:
-                    ok = False
-
-                if not ok:
-                    continue
-
-                out_id = str(out.get("id", ""))
-                source_id = str(out.get("source_id", "")).strip()
-                if src_name_by_id.get(source_id, "") == target_source:
-                    break
-
-                try:
-                    pa.move_source_output(out_id, target_source)
-                except Exception:
-                    pass
-                break
-    save_state(st)
+            target_source = next(_matching_targets(compiled_mic_routes, existing_sources, props), None)
+            if target_source is None or existing_sources[target_source] == out.get("source_id"):
+                continue
+
+            try:
+                pa.move_source_output(out["id"], target_source)
+            except Exception:
+                pass
+
+    # Most passes change nothing; don't serialize/rewrite the state file then.
+    if st != st_loaded:
+        save_state(st)
+    _LAST_PASS_SIGNATURE = signature
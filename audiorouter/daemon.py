@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import atexit
 import os
+import random
 import signal
+import socket
 import subprocess
 import time
 import re
+import select
 import threading
 from pathlib import Path
 
@@ -13,8 +16,24 @@ from .core import apply_once, route_sink_input_now, route_source_output_now
 from . import pactl as pa
 
 _STOP = False
-EVENT_DEBOUNCE_SEC = 0.25
 MAINTENANCE_APPLY_SEC = 5.0
+APPLY_COALESCE_SEC = 0.05
+FALLBACK_WATCH_SEC = 0.25
+EVENT_LISTEN_TIMEOUT_SEC = 0.5
+# Follow-up listens that drain back-to-back events into one batch
+EVENT_DRAIN_SEC = 0.005
+EVENT_BATCH_MAX_SEC = 0.05
+RECONNECT_BASE_SEC = 0.25
+RECONNECT_CAP_SEC = 5.0
+
+# Trailing-edge debounce state for schedule_apply()
+_APPLY_LOCK = threading.Lock()
+_APPLY_EVENT = threading.Event()
+_APPLY_DUE = 0.0
+_APPLY_THREAD: threading.Thread | None = None
+# Rate limit state for schedule_maintenance_apply()
+_MAINTENANCE_LAST = 0.0
+_MAINTENANCE_TIMER: threading.Timer | None = None
 
 
 def _handle_stop(_sig, _frame):
@@ -43,11 +62,20 @@ def _pid_alive(pid: int) -> bool:
         return True
 
 
+def _read_pid(path: Path) -> int:
+    """PID from a lock file (-1 if empty), with one small read and no decode."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, 32).strip()
+    finally:
+        os.close(fd)
+    return int(data) if data else -1
+
+
 def _cleanup_lock() -> None:
     """Best-effort lock cleanup on exit (only remove if it is ours)."""
     try:
-        txt = LOCK_FILE.read_text(encoding="utf-8").strip()
-        if txt == str(os.getpid()):
+        if _read_pid(LOCK_FILE) == os.getpid():
             LOCK_FILE.unlink()
     except Exception:
         pass
@@ -65,8 +93,7 @@ def _try_acquire_daemon_lock() -> bool:
     except FileExistsError:
         # Lock exists -> check if stale
         try:
-            txt = LOCK_FILE.read_text(encoding="utf-8").strip()
-            pid = int(txt) if txt else -1
+            pid = _read_pid(LOCK_FILE)
         except Exception:
             # If we can't parse PID, assume locked (avoid race / accidental takeover)
             return False
@@ -95,16 +122,53 @@ def _try_acquire_daemon_lock() -> bool:
     return True
 
 
+def _pulse_socket_ready() -> bool:
+    """
+    Cheap readiness fast path: does the default Pulse native socket
+    (pipewire-pulse) accept connections? False only means "not confirmed
+    here" (custom server, Flatpak sandbox, no runtime dir, not up yet);
+    pactl still has to be asked then.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir or os.environ.get("PULSE_SERVER"):
+        return False
+    if os.environ.get("FLATPAK_ID") or Path("/.flatpak-info").exists():
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(0.2)
+        sock.connect(os.path.join(runtime_dir, "pulse", "native"))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
 def wait_for_pipewire(timeout: float = 15.0) -> bool:
     start = time.monotonic()
+    # Probe quickly at first, then back off (jittered, so autostarted
+    # sessions don't probe in step) while the server is still coming up.
+    delay = 0.1
     while time.monotonic() - start < timeout and not _STOP:
-        # Use shared pactl wrapper so Flatpak runs this via flatpak-spawn --host.
-        if pa.try_pactl("info"):
+        # Socket probe first; otherwise the shared pactl wrapper (flatpak-spawn --host
+        # in Flatpak), which also finds PULSE_RUNTIME_PATH / client.conf servers.
+        if _pulse_socket_ready() or pa.try_pactl("info"):
             return True
-        time.sleep(0.5)
+        remaining = timeout - (time.monotonic() - start)
+        time.sleep(max(0.0, min(remaining, delay * random.uniform(0.5, 1.5))))
+        delay = min(delay * 2, 2.0)
     return False
 
 
+def _reconnect_delay(attempt: int) -> float:
+    """
+    Exponential backoff with full jitter, so sessions whose daemons lost the
+    same server don't all reconnect in lockstep.
+    """
+    return random.uniform(0.0, min(RECONNECT_CAP_SEC, RECONNECT_BASE_SEC * (2 ** attempt)))
+
+
 def _run_apply_once(reason: str = "") -> None:
     try:
         apply_once()
@@ -112,13 +176,83 @@ def _run_apply_once(reason: str = "") -> None:
         pass
 
 
+def _apply_worker() -> None:
+    while not _STOP:
+        if not _APPLY_EVENT.wait(0.5):
+            continue
+        # Sleep until no new trigger arrived for APPLY_COALESCE_SEC.
+        while not _STOP:
+            with _APPLY_LOCK:
+                delay = _APPLY_DUE - time.monotonic()
+            if delay <= 0:
+                break
+            time.sleep(delay)
+        _APPLY_EVENT.clear()
+        _run_apply_once("scheduled")
+
+
+def schedule_apply(reason: str = "") -> None:
+    """
+    Request a reconciliation pass. Bursts of calls collapse into a single
+    apply_once() run shortly after the last one.
+    """
+    global _APPLY_DUE, _APPLY_THREAD
+    with _APPLY_LOCK:
+        _APPLY_DUE = time.monotonic() + APPLY_COALESCE_SEC
+        if _APPLY_THREAD is None or not _APPLY_THREAD.is_alive():
+            _APPLY_THREAD = threading.Thread(target=_apply_worker, name="audiorouter-apply", daemon=True)
+            _APPLY_THREAD.start()
+    _APPLY_EVENT.set()
+
+
+def _fire_maintenance_apply(reason: str) -> None:
+    global _MAINTENANCE_LAST, _MAINTENANCE_TIMER
+    with _APPLY_LOCK:
+        _MAINTENANCE_TIMER = None
+        _MAINTENANCE_LAST = time.monotonic()
+    schedule_apply(reason)
+
+
+def schedule_maintenance_apply(reason: str = "") -> None:
+    """
+    Rate-limited schedule_apply() for low-value ("other") events: at most one
+    pass per MAINTENANCE_APPLY_SEC. Events inside the window are not dropped;
+    they get one trailing pass when it ends.
+    """
+    global _MAINTENANCE_LAST, _MAINTENANCE_TIMER
+    with _APPLY_LOCK:
+        wait = _MAINTENANCE_LAST + MAINTENANCE_APPLY_SEC - time.monotonic()
+        if wait > 0:
+            if _MAINTENANCE_TIMER is None:
+                _MAINTENANCE_TIMER = threading.Timer(wait, _fire_maintenance_apply, (reason,))
+                _MAINTENANCE_TIMER.daemon = True
+                _MAINTENANCE_TIMER.start()
+            return
+        _MAINTENANCE_LAST = time.monotonic()
+    schedule_apply(reason)
+
+
+# `pactl subscribe` lines have a fixed shape: Event 'new' on sink-input #42
+_NEW_SINK_INPUT_PREFIX = "Event 'new' on sink-input #"
+_NEW_SOURCE_OUTPUT_PREFIX = "Event 'new' on source-output #"
+
+
 def _is_new_sink_input_event_line(line: str) -> bool:
-    txt = line.lower()
-    return "on sink-input" in txt and "'new'" in txt
+    return line.startswith(_NEW_SINK_INPUT_PREFIX)
+
+
+def _id_from_subscribe_line(line: str) -> str:
+    _, sep, tail = line.rpartition("#")
+    num = tail.strip()
+    return num if sep and num.isdigit() else ""
 
 
-_SINK_INPUT_ID_RE = re.compile(r"sink-input\s+#(\d+)", re.IGNORECASE)
-_SOURCE_OUTPUT_ID_RE = re.compile(r"source-output\s+#(\d+)", re.IGNORECASE)
+# Sinks/sources/modules/server (default sink) are what bus routing depends on.
+# Only their appearing/disappearing (and server changes) alter the topology;
+# a plain "change" on a sink/source is mostly volume/mute and only warrants
+# the rate-limited maintenance pass.
+_TOPOLOGY_EVENT_RE = re.compile(r"Event '(?:new|remove)' on (?:sink|source|module)\s+#|on server", re.IGNORECASE)
+_TOPOLOGY_FACILITIES = ("sink", "source", "module", "server")
 
 
 def _sink_input_id_from_pulsectl_event(ev) -> str:
@@ -133,13 +267,15 @@ def _sink_input_id_from_pulsectl_event(ev) -> str:
 
 
 def _sink_input_id_from_subscribe_line(line: str) -> str:
-    m = _SINK_INPUT_ID_RE.search(line)
-    return m.group(1) if m else ""
+    return _id_from_subscribe_line(line)
+
+
+def _is_topology_event_line(line: str) -> bool:
+    return _TOPOLOGY_EVENT_RE.search(line) is not None
 
 
 def _is_new_source_output_event_line(line: str) -> bool:
-    txt = line.lower()
-    return "on source-output" in txt and "'new'" in txt
+    return line.startswith(_NEW_SOURCE_OUTPUT_PREFIX)
 
 
 def _source_output_id_from_pulsectl_event(ev) -> str:
@@ -154,59 +290,87 @@ def _source_output_id_from_pulsectl_event(ev) -> str:
 
 
 def _source_output_id_from_subscribe_line(line: str) -> str:
-    m = _SOURCE_OUTPUT_ID_RE.search(line)
-    return m.group(1) if m else ""
+    return _id_from_subscribe_line(line)
 
 
-def _try_route_new_source_output_immediately(source_output_id: str, reason: str) -> None:
+def _try_route_new_source_output_immediately(source_output_id: str, reason: str, snap: dict | None = None) -> bool:
+    """
+    True once the fast path confirmed the stream sits on its target. Anything
+    else (failed move, no plan yet, error) needs a full pass to take over.
+    """
     sid = str(source_output_id).strip()
     if not sid:
-        return
+        return False
     try:
-        route_source_output_now(sid)
+        return route_source_output_now(sid, snap)
     except Exception:
-        pass
+        return False
 
 
-def _try_route_new_input_immediately(sink_input_id: str, reason: str) -> None:
+def _try_route_new_input_immediately(sink_input_id: str, reason: str, snap: dict | None = None) -> bool:
+    """
+    True once the fast path confirmed the stream sits on its target. Anything
+    else (failed move, no plan yet, error) needs a full pass to take over.
+    """
     sid = str(sink_input_id).strip()
     if not sid:
-        return
+        return False
     try:
-        route_sink_input_now(sid)
+        return route_sink_input_now(sid, snap)
     except Exception:
-        pass
+        return False
 
 
-def _is_new_pulsectl_event(ev) -> bool:
+# libpulse PA_SUBSCRIPTION_EVENT_* type codes
+_PULSE_EVENT_TYPE_CODES = {"new": 0x0000, "change": 0x0010, "remove": 0x0020}
+
+
+def _is_pulsectl_event_type(ev, kind: str) -> bool:
     """
     pulsectl event types are backend/version dependent.
     Depending on platform this may be an enum, string-like enum repr,
-    or an int value. Normalize defensively so "new" events are recognized.
+    or an int value. Normalize defensively so ``kind`` events are recognized.
     """
     t = getattr(ev, "t", "")
 
     # Common case: enum-like object with a name attribute
     name = getattr(t, "name", None)
-    if isinstance(name, str) and name.lower() == "new":
+    if isinstance(name, str) and name.lower() == kind:
         return True
 
     # String/enum repr variants, e.g. "new", "PulseEventTypeEnum.new"
     txt = str(t).strip().lower()
-    if txt == "new" or txt.endswith(".new"):
+    if txt == kind or txt.endswith("." + kind):
         return True
 
-    # Fallback for int-like values (libpulse PA_SUBSCRIPTION_EVENT_NEW == 0x0000)
+    # Fallback for int-like values
     try:
-        return int(t) == 0
+        return int(t) == _PULSE_EVENT_TYPE_CODES[kind]
     except Exception:
         return False
 
 
-def _scan_sink_input_ids() -> set[str]:
+def _is_new_pulsectl_event(ev) -> bool:
+    return _is_pulsectl_event_type(ev, "new")
+
+
+def _is_topology_pulsectl_event(ev) -> bool:
+    # pulsectl EnumValue compares equal to its plain name
+    ev_facility = getattr(ev, "facility", "")
+    if ev_facility == "server":
+        return True
+    if not any(ev_facility == f for f in _TOPOLOGY_FACILITIES):
+        return False
+    return _is_new_pulsectl_event(ev) or _is_pulsectl_event_type(ev, "remove")
+
+
+def _scan_sink_input_ids(snap: dict | None = None) -> set[str]:
     ids: set[str] = set()
     try:
-        for inp in pa.list_sink_inputs():
+        inputs = pa.list_sink_inputs()
+        if snap is not None:
+            snap["sink_inputs"] = inputs
+        for inp in inputs:
             sid = str(inp.get("id", "")).strip()
             if sid:
                 ids.add(sid)
@@ -215,17 +379,19 @@ def _scan_sink_input_ids() -> set[str]:
     return ids
 
 
-def _watch_new_sink_inputs(poll_sec: float = 0.01) -> None:
+def _watch_new_sink_inputs(poll_sec: float = FALLBACK_WATCH_SEC) -> None:
     """
-    Safety net: actively detect fresh sink-input IDs so short-lived system sounds
-    can be routed even when event backends emit only delayed/"other" updates.
+    Safety net for the subscribe fallback: actively detect fresh sink-input IDs
+    so streams are routed even when `pactl subscribe` emits delayed updates.
     """
     seen = _scan_sink_input_ids()
     while not _STOP:
-        current = _scan_sink_input_ids()
+        # the scan's listing is handed to the router, so new ids cost no re-list
+        snap: dict = {}
+        current = _scan_sink_input_ids(snap)
         new_ids = current - seen
         for sid in sorted(new_ids):
-            _try_route_new_input_immediately(sid, "poll:new")
+            _try_route_new_input_immediately(sid, "poll:new", snap)
         # Keep memory bounded to currently existing IDs
         seen = current
         time.sleep(poll_sec)
@@ -233,10 +399,13 @@ def _watch_new_sink_inputs(poll_sec: float = 0.01) -> None:
 
 
 
-def _scan_source_output_ids() -> set[str]:
+def _scan_source_output_ids(snap: dict | None = None) -> set[str]:
     ids: set[str] = set()
     try:
-        for out in pa.list_source_outputs():
+        outs = pa.list_source_outputs()
+        if snap is not None:
+            snap["source_outputs"] = outs
+        for out in outs:
             sid = str(out.get("id", "")).strip()
             if sid:
                 ids.add(sid)
@@ -245,16 +414,56 @@ def _scan_source_output_ids() -> set[str]:
     return ids
 
 
-def _watch_new_source_outputs(poll_sec: float = 0.01) -> None:
+def _watch_new_source_outputs(poll_sec: float = FALLBACK_WATCH_SEC) -> None:
     seen = _scan_source_output_ids()
     while not _STOP:
-        current = _scan_source_output_ids()
+        snap: dict = {}
+        current = _scan_source_output_ids(snap)
         new_ids = current - seen
         for sid in sorted(new_ids):
-            _try_route_new_source_output_immediately(sid, "poll:new")
+            _try_route_new_source_output_immediately(sid, "poll:new", snap)
         seen = current
         time.sleep(poll_sec)
 
+def _handle_pulsectl_events(events: list) -> None:
+    topology = maintenance = False
+    new_streams: dict[tuple[bool, str], None] = {}
+    for ev in events:
+        # pulsectl EnumValue compares equal to its plain name
+        ev_facility = getattr(ev, "facility", "")
+        if _is_topology_pulsectl_event(ev):
+            topology = True
+        elif any(ev_facility == f for f in _TOPOLOGY_FACILITIES):
+            # sink/source/module "change" (volume, mute, ...)
+            maintenance = True
+        elif _is_new_pulsectl_event(ev):
+            is_source_output = "source_output" in str(ev_facility).lower()
+            if is_source_output:
+                sid = _source_output_id_from_pulsectl_event(ev)
+            else:
+                sid = _sink_input_id_from_pulsectl_event(ev)
+            new_streams[(is_source_output, sid)] = None
+        else:
+            # "other" events are noisy and expensive if they trigger full
+            # reconciliation each time. Keep a low-rate maintenance pass.
+            maintenance = True
+
+    # Incremental: only the new streams are routed; a full pass is needed
+    # when a fast path did not confirm its move or the topology changed.
+    for is_source_output, sid in new_streams:
+        if is_source_output:
+            ok = _try_route_new_source_output_immediately(sid, "pulsectl:new")
+        else:
+            ok = _try_route_new_input_immediately(sid, "pulsectl:new")
+        if not ok:
+            schedule_apply("pulsectl:new")
+
+    if topology:
+        schedule_apply("pulsectl:topology")
+    elif maintenance:
+        schedule_maintenance_apply("pulsectl:maintenance")
+
+
 def run_daemon():
 
     # Single-instance guard
@@ -268,10 +477,6 @@ def run_daemon():
     # 2) Apply once initially
     _run_apply_once("startup")
 
-    # 2b) Start active new-input watcher as safety net for delayed event backends
-    threading.Thread(target=_watch_new_sink_inputs, name="audiorouter-new-input-watch", daemon=True).start()
-    threading.Thread(target=_watch_new_source_outputs, name="audiorouter-new-source-output-watch", daemon=True).start()
-
     # 3) Event-driven if pulsectl is available, otherwise fallback subscribe
     try:
         import pulsectl  # type: ignore
@@ -279,51 +484,52 @@ def run_daemon():
         pulsectl = None
 
     if pulsectl is None:
+        # Slow id watchers as safety net in case `pactl subscribe` lines arrive
+        # late; with pulsectl the "new" callbacks below cover this.
+        threading.Thread(target=_watch_new_sink_inputs, name="audiorouter-new-input-watch", daemon=True).start()
+        threading.Thread(target=_watch_new_source_outputs, name="audiorouter-new-source-output-watch", daemon=True).start()
         _fallback_subscribe()
         return
 
     # Reconnect loop (important!)
+    attempt = 0
     while not _STOP:
         try:
             with pulsectl.Pulse("audiorouter-daemon") as pulse:
-                last = 0.0
-                last_maintenance = 0.0
+                # instead of "all": streams for the per-stream fast path,
+                # sinks/sources/modules/server for bus routing resyncs
+                pulse.event_mask_set("sink_input", "source_output", *_TOPOLOGY_FACILITIES)
+                attempt = 0
 
-                # instead of "all": only what we need
-                pulse.event_mask_set("sink_input", "source_output")
+                batch: list = []
 
                 def cb(_ev):
-                    nonlocal last, last_maintenance
-
-                    if _is_new_pulsectl_event(_ev):
-                        facility = str(getattr(_ev, "facility", "")).lower()
-                        if "source_output" in facility:
-                            _try_route_new_source_output_immediately(_source_output_id_from_pulsectl_event(_ev), "pulsectl:new")
-                        else:
-                            _try_route_new_input_immediately(_sink_input_id_from_pulsectl_event(_ev), "pulsectl:new")
-                        _run_apply_once("pulsectl:new")
-                        return
-
-                    now = time.monotonic()
-                    if now - last < EVENT_DEBOUNCE_SEC:
-                        return
-                    last = now
-
-                    # "other" events are noisy and expensive if they trigger full
-                    # reconciliation each time. Keep a low-rate maintenance pass.
-                    if now - last_maintenance < MAINTENANCE_APPLY_SEC:
-                        return
-                    last_maintenance = now
-                    _run_apply_once("pulsectl:maintenance")
+                    # only collect here; wake event_listen() so the whole
+                    # burst is handled once per wake, not once per event
+                    batch.append(_ev)
+                    raise pulsectl.PulseLoopStop
 
                 pulse.event_callback_set(cb)
 
+                # timed listen so a stop request is seen without waiting for an event
                 while not _STOP:
-                    pulse.event_listen()
+                    pulse.event_listen(timeout=EVENT_LISTEN_TIMEOUT_SEC)
+                    if not batch:
+                        continue
+                    # drain events that arrive right behind the first one;
+                    # note pulsectl treats timeout=0 as "no timeout"
+                    deadline = time.monotonic() + EVENT_BATCH_MAX_SEC
+                    seen = 0
+                    while len(batch) != seen and time.monotonic() < deadline:
+                        seen = len(batch)
+                        pulse.event_listen(timeout=EVENT_DRAIN_SEC)
+                    events, batch[:] = list(batch), []
+                    _handle_pulsectl_events(events)
 
         except Exception:
             # PipeWire/Pulse was briefly unavailable -> wait and reconnect
-            time.sleep(1.0)
+            time.sleep(_reconnect_delay(attempt))
+            attempt = min(attempt + 1, 8)
 
 
 def _fallback_poll():
@@ -348,39 +554,44 @@ def _fallback_subscribe():
             if os.environ.get("FLATPAK_ID") or Path("/.flatpak-info").exists():
                 cmd = ["flatpak-spawn", "--host", *cmd]
 
+            # Raw pipe + os.read(): whole bursts of lines per syscall, and the
+            # select() timeout lets us notice _STOP without a new event.
             proc = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.DEVNULL,
-                text=True,
-                bufsize=1,
+                bufsize=0,
             )
+            fd = proc.stdout.fileno()
+            pending = b""
 
-            last = 0.0
-            last_maintenance = 0.0
-            while not _STOP and proc.stdout is not None:
-                line = proc.stdout.readline()
-                if not line:
+            while not _STOP:
+                ready, _, _ = select.select([fd], [], [], EVENT_LISTEN_TIMEOUT_SEC)
+                if not ready:
+                    continue
+                chunk = os.read(fd, 4096)
+                if not chunk:
                     break
+                *lines, pending = (pending + chunk).split(b"\n")
 
-                if _is_new_sink_input_event_line(line):
-                    _try_route_new_input_immediately(_sink_input_id_from_subscribe_line(line), "subscribe:new")
-                    _run_apply_once("subscribe:new")
-                    continue
+                for raw in lines:
+                    line = raw.decode("utf-8", "replace")
 
-                if _is_new_source_output_event_line(line):
-                    _try_route_new_source_output_immediately(_source_output_id_from_subscribe_line(line), "subscribe:new")
-                    _run_apply_once("subscribe:new")
-                    continue
+                    if _is_new_sink_input_event_line(line):
+                        if not _try_route_new_input_immediately(_sink_input_id_from_subscribe_line(line), "subscribe:new"):
+                            schedule_apply("subscribe:new")
+                        continue
 
-                now = time.monotonic()
-                if now - last < EVENT_DEBOUNCE_SEC:
-                    continue
-                last = now
-                if now - last_maintenance < MAINTENANCE_APPLY_SEC:
-                    continue
-                last_maintenance = now
-                _run_apply_once("subscribe:maintenance")
+                    if _is_new_source_output_event_line(line):
+                        if not _try_route_new_source_output_immediately(_source_output_id_from_subscribe_line(line), "subscribe:new"):
+                            schedule_apply("subscribe:new")
+                        continue
+
+                    if _is_topology_event_line(line):
+                        schedule_apply("subscribe:topology")
+                        continue
+
+                    schedule_maintenance_apply("subscribe:maintenance")
 
         except Exception:
             pass
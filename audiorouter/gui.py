@@ -33,25 +33,29 @@ def open_donate(_btn):
     launcher.launch(None)
 
 
+_SLUG_NONALNUM_RE = re.compile(r"[^a-z0-9]+")
+_SLUG_DASHES_RE = re.compile(r"-+")
+_UMLAUT_TABLE = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
 def slugify_label(label: str) -> str:
-    s = label.strip().lower()
-    s = s.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
-    s = re.sub(r"[^a-z0-9]+", "-", s)
-    s = re.sub(r"-+", "-", s).strip("-")
+    s = label.strip().lower().translate(_UMLAUT_TABLE)
+    s = _SLUG_NONALNUM_RE.sub("-", s)
+    s = _SLUG_DASHES_RE.sub("-", s).strip("-")
     return s or "bus"
 
 def make_bus_name(label: str, existing_names: set[str]) -> str:
     base = f"vsink.{slugify_label(label)}"
-    name = base
-    i = 2
-    while name in existing_names:
-        name = f"{base}-{i}"
-        i += 1
-    return name
-
-def friendly_sink_list():
-    sinks = pa.list_sinks()
-    descriptions = pa.list_sink_descriptions()
+    if base not in existing_names:
+        return base
+    # one pass over the names instead of probing base-2, base-3, ...
+    suffix_re = re.compile(rf"{re.escape(base)}-(\d+)")
+    taken = [int(m.group(1)) for m in map(suffix_re.fullmatch, existing_names) if m]
+    return f"{base}-{max(taken, default=1) + 1}"
+
+def friendly_sink_list(snap: dict):
+    sinks = snap["sinks"]
+    descriptions = snap["sink_descriptions"]
     items = [("default", "Default (current default sink)"), ("none", "No routing")]
     for s in sinks:
         name = s["name"]
@@ -84,6 +88,8 @@ class MainWindow(Adw.ApplicationWindow):
         self._apply_running = False
         self._apply_queued = False
         self._apply_refresh_requested = False
+        # section -> data its rows were last built from (see _rows_current)
+        self._row_keys: dict[str, object] = {}
 
         self.stream_target_group = Gtk.SizeGroup(mode=Gtk.SizeGroupMode.HORIZONTAL)
         self.stream_move_group = Gtk.SizeGroup(mode=Gtk.SizeGroupMode.HORIZONTAL)
@@ -276,8 +282,12 @@ class MainWindow(Adw.ApplicationWindow):
         mic_scroll.set_child(self.mic_stream_list)
         right.append(mic_scroll)
 
-        apply_once()
-        self.refresh_all()
+        self._lock_file = Path(os.environ.get("XDG_CACHE_HOME", str(Path.home() / ".cache"))) / "audiorouter-daemon.lock"
+        self._daemon_pid: int | None = None
+        self._lock_monitor = Gio.File.new_for_path(str(self._lock_file)).monitor_file(Gio.FileMonitorFlags.NONE, None)
+        self._lock_monitor.connect("changed", self._on_lock_file_changed)
+
+        self._apply_once_async()
 
     def _setup_header_menu(self, header: Adw.HeaderBar) -> None:
         actions = Gio.SimpleActionGroup()
@@ -662,11 +672,30 @@ class MainWindow(Adw.ApplicationWindow):
         threading.Thread(target=_worker, daemon=True).start()
 
     def refresh_all(self):
+        self._apply_snapshot(self._read_snapshot())
+
+    def _read_snapshot(self) -> dict:
+        # Read the server once per refresh; every section works from this.
+        # No GTK calls here: _apply_once_async() runs this off the main thread.
+        server_ok = bool(pa.try_pactl("info").strip())
+        return {
+            "server_ok": server_ok,
+            "default_sink": (pa.get_default_sink() if server_ok else "") or "-",
+            "sinks": pa.list_sinks(),
+            "sink_descriptions": pa.list_sink_descriptions(),
+            # loopbacks are routing internals, never shown
+            "sink_inputs": pa.list_sink_inputs(predicate=lambda i: not is_internal_loopback(i)),
+            "sources": pa.list_sources(),
+            "source_descriptions": pa.list_source_descriptions(),
+            "loopbacks": pa.loopback_index(),
+        }
+
+    def _apply_snapshot(self, snap: dict) -> None:
         self.cfg = load_config()
-        self.refresh_buses()
-        stream_count = self.refresh_streams()
-        mic_count = self.refresh_mic_streams()
-        self.refresh_status(stream_count + mic_count)
+        self.refresh_buses(snap)
+        stream_count = self.refresh_streams(snap)
+        mic_count = self.refresh_mic_streams(snap)
+        self.refresh_status(stream_count + mic_count, snap)
         self._refresh_policy_toggle_button()
 
     def on_autostart_toggled(self, btn: Gtk.CheckButton):
@@ -688,24 +717,36 @@ class MainWindow(Adw.ApplicationWindow):
         except PermissionError:
             return True
 
-    def _daemon_running(self) -> bool:
-        lock_file = Path(os.environ.get("XDG_CACHE_HOME", str(Path.home() / ".cache"))) / "audiorouter-daemon.lock"
-        if not lock_file.exists():
-            return False
+    def _read_daemon_pid(self) -> int:
+        # one open + small read; a missing/garbled file is simply "not running"
+        try:
+            fd = os.open(self._lock_file, os.O_RDONLY)
+        except OSError:
+            return -1
         try:
-            pid = int(lock_file.read_text(encoding="utf-8").strip())
+            return int(os.read(fd, 32).strip())
         except Exception:
-            return False
-        return self._is_pid_alive(pid)
+            return -1
+        finally:
+            os.close(fd)
 
-    def refresh_status(self, stream_count: int):
-        info = pa.try_pactl("info")
-        pipewire_ok = bool(info.strip())
+    def _on_lock_file_changed(self, _monitor, _file, _other, _event) -> None:
+        # daemon started/stopped: re-read the PID and update the card right away
+        self._daemon_pid = None
+        self._set_status_card(self.status_card_daemon, "✅ läuft" if self._daemon_running() else "⚠️ gestoppt")
 
-        if pipewire_ok:
-            default_sink = pa.get_default_sink() or "-"
-            sink_count = len(pa.list_sinks())
-            sink_desc = pa.list_sink_descriptions().get(default_sink, default_sink)
+    def _daemon_running(self) -> bool:
+        # The PID only changes with the lock file (watched below); liveness
+        # is still checked each time in case the daemon died without cleanup.
+        if self._daemon_pid is None:
+            self._daemon_pid = self._read_daemon_pid()
+        return self._is_pid_alive(self._daemon_pid)
+
+    def refresh_status(self, stream_count: int, snap: dict):
+        if snap["server_ok"]:
+            default_sink = snap["default_sink"]
+            sink_count = len(snap["sinks"])
+            sink_desc = snap["sink_descriptions"].get(default_sink, default_sink)
             self._set_status_card(self.status_card_pipewire, f"✅ bereit ({sink_count} Sinks)")
             self._set_status_card(self.status_card_default_sink, sink_desc)
         else:
@@ -715,14 +756,27 @@ class MainWindow(Adw.ApplicationWindow):
         self._set_status_card(self.status_card_daemon, "✅ läuft" if self._daemon_running() else "⚠️ gestoppt")
         self._set_status_card(self.status_card_streams, str(stream_count))
 
-    def refresh_buses(self):
-        for child in list(self.bus_list):
-            self.bus_list.remove(child)
+    def _rows_current(self, section: str, key: object) -> bool:
+        """
+        True if the rows of ``section`` were built from data equal to ``key``,
+        so a refresh can keep the existing widgets. Otherwise remember key.
+        """
+        if section in self._row_keys and self._row_keys[section] == key:
+            return True
+        self._row_keys[section] = key
+        return False
 
-        sink_items = friendly_sink_list()
+    def refresh_buses(self, snap: dict):
+        sink_items = friendly_sink_list(snap)
         sink_labels = [t for _, t in sink_items]
 
         buses = self.cfg.get("buses", [])
+        if self._rows_current("buses", (buses, sink_items)):
+            return
+
+        for child in list(self.bus_list):
+            self.bus_list.remove(child)
+
         if not buses:
             # placeholder
             row = Gtk.ListBoxRow()
@@ -733,6 +787,9 @@ class MainWindow(Adw.ApplicationWindow):
             self.bus_list.append(row)
             return
 
+        # one model for every bus row instead of one per DropDown
+        sink_model = Gtk.StringList.new(sink_labels)
+
         for b in buses:
             row = Gtk.ListBoxRow()
             box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12,
@@ -751,7 +808,7 @@ class MainWindow(Adw.ApplicationWindow):
             label_lbl.set_ellipsize(Pango.EllipsizeMode.END)
             box.append(label_lbl)
 
-            dd = Gtk.DropDown.new_from_strings(sink_labels)
+            dd = Gtk.DropDown(model=sink_model)
             dd.set_hexpand(True)
             route_to = b.get("route_to", "default")
             idx = 0
@@ -786,12 +843,20 @@ class MainWindow(Adw.ApplicationWindow):
             return {"app": app}
         return {}
 
-    def _find_rule_index(self, rules: list, match: dict) -> int:
+    def _rule_index_by_match(self, rules: list) -> dict:
         # exakter match-Vergleich: {"binary":"vivaldi"} etc.
+        # match (as sorted items) -> index of the first rule with that match
+        index: dict = {}
         for idx, r in enumerate(rules):
-            if r.get("match") == match:
-                return idx
-        return -1
+            match = r.get("match")
+            if not isinstance(match, dict):
+                continue
+            try:
+                index.setdefault(tuple(sorted(match.items())), idx)
+            except TypeError:
+                # unhashable values can never equal a stream's string match
+                continue
+        return index
  
  
     def _find_input_rule_index(self, rules: list, source_name: str) -> int:
@@ -800,12 +865,16 @@ class MainWindow(Adw.ApplicationWindow):
                 return idx
         return -1
 
-    def refresh_mic_streams(self):
+    def refresh_mic_streams(self, snap: dict):
+        sources = [s for s in snap["sources"] if not s.get("name", "").endswith(".monitor")]
+
+        key = (sources, snap["source_descriptions"], snap["loopbacks"], self.cfg.get("buses", []), self.cfg.get("input_routes", []))
+        if self._rows_current("mic_streams", key):
+            return len(sources)
+
         for child in list(self.mic_stream_list):
             self.mic_stream_list.remove(child)
 
-        sources = [s for s in pa.list_sources() if not s.get("name", "").endswith(".monitor")]
-
         if not sources:
             row = Gtk.ListBoxRow()
             box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12,
@@ -818,7 +887,9 @@ class MainWindow(Adw.ApplicationWindow):
         buses = [b["name"] for b in self.cfg.get("buses", [])]
         input_targets = ["no routing", *buses]
         input_routes = self.cfg.get("input_routes", [])
-        source_desc = pa.list_source_descriptions()
+        source_desc = snap["source_descriptions"]
+
+        target_model = Gtk.StringList.new(input_targets)
 
         for src in sources:
             row = Gtk.ListBoxRow()
@@ -836,11 +907,12 @@ class MainWindow(Adw.ApplicationWindow):
             box.append(label)
 
             if input_targets:
-                dd = Gtk.DropDown.new_from_strings(input_targets)
+                dd = Gtk.DropDown(model=target_model)
                 dd.set_size_request(170, -1)
                 self.mic_target_group.add_widget(dd)
 
-                current_target = pa.current_loopback_sink_for_source(source_name)
+                # first loopback from this source, like current_loopback_sink_for_source()
+                current_target = next(iter(snap["loopbacks"].get(source_name, ())), "")
                 rule_idx = self._find_input_rule_index(input_routes, source_name)
                 has_rule = rule_idx >= 0
 
@@ -903,8 +975,7 @@ class MainWindow(Adw.ApplicationWindow):
                     if has_rule:
                         cfg["input_routes"] = [r for r in cfg["input_routes"] if str(r.get("source", "")).strip() != source_name]
                         save_config(cfg)
-                        apply_once()
-                        self.refresh_all()
+                        self._apply_once_async()
                         return
 
                     target = input_targets[dropdown.get_selected()]
@@ -912,8 +983,7 @@ class MainWindow(Adw.ApplicationWindow):
                     if not _is_no_routing_target(target):
                         cfg["input_routes"].append({"source": source_name, "target_bus": target})
                     save_config(cfg)
-                    apply_once()
-                    self.refresh_all()
+                    self._apply_once_async()
 
                 btn_rule.connect("clicked", on_rule_toggle)
                 box.append(btn_rule)
@@ -922,14 +992,15 @@ class MainWindow(Adw.ApplicationWindow):
 
         return len(sources)
 
-    def refresh_streams(self):
-        for child in list(self.stream_list):
-            self.stream_list.remove(child)
+    def refresh_streams(self, snap: dict):
+        inputs = snap["sink_inputs"]
 
-        inputs = pa.list_sink_inputs()
+        key = (inputs, snap["sinks"], self.cfg.get("buses", []), self.cfg.get("rules", []))
+        if self._rows_current("streams", key):
+            return len(inputs)
 
-        # Filter loopbacks (routing internals)
-        inputs = [i for i in inputs if (not i.get("props", {})) or not is_internal_loopback(i)]
+        for child in list(self.stream_list):
+            self.stream_list.remove(child)
 
         if not inputs:
             row = Gtk.ListBoxRow()
@@ -946,11 +1017,14 @@ class MainWindow(Adw.ApplicationWindow):
         buses = [b["name"] for b in self.cfg.get("buses", [])]
         app_targets = list(buses)
         rules = self.cfg.get("rules", [])
+        rule_index = self._rule_index_by_match(rules)
 
         # Map sink_id -> sink_name
-        sink_id_to_name = {s["id"]: s["name"] for s in pa.list_sinks()}
+        sink_id_to_name = {s["id"]: s["name"] for s in snap["sinks"]}
 
 
+        target_model = Gtk.StringList.new(app_targets)
+
         for inp in inputs:
             row = Gtk.ListBoxRow()
             box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12,
@@ -970,7 +1044,7 @@ class MainWindow(Adw.ApplicationWindow):
             box.append(label)
 
             if app_targets:
-                dd = Gtk.DropDown.new_from_strings(app_targets)
+                dd = Gtk.DropDown(model=target_model)
                 dd.set_size_request(170, -1)
                 self.stream_target_group.add_widget(dd)
 
@@ -1003,7 +1077,7 @@ class MainWindow(Adw.ApplicationWindow):
 
                 # --- Rule UI (Add / Delete toggle) ---
                 match = self._stream_match_obj(app, binary, app_id)
-                rule_idx = self._find_rule_index(rules, match) if match else -1
+                rule_idx = rule_index.get(tuple(sorted(match.items())), -1) if match else -1
                 has_rule = rule_idx >= 0
 
                 # If rule exists: preselect its target bus in the dropdown
@@ -1030,16 +1104,14 @@ class MainWindow(Adw.ApplicationWindow):
                         # delete rule
                         cfg["rules"] = [r for r in cfg["rules"] if r.get("match") != match]
                         save_config(cfg)
-                        apply_once()
-                        self.refresh_all()
+                        self._apply_once_async()
                         return
 
                     # add rule
                     target = app_targets[dropdown.get_selected()]
                     cfg["rules"].append({"match": match, "target_bus": target})
                     save_config(cfg)
-                    apply_once()
-                    self.refresh_all()
+                    self._apply_once_async()
 
                 btn_rule.connect("clicked", on_rule_toggle)
                 box.append(btn_rule)
@@ -1064,8 +1136,7 @@ class MainWindow(Adw.ApplicationWindow):
         save_config(cfg)
 
         self.entry_bus_label.set_text("")
-        apply_once()
-        self.refresh_all()
+        self._apply_once_async()
         self.entry_bus_label.grab_focus()
 
 
@@ -1075,8 +1146,7 @@ class MainWindow(Adw.ApplicationWindow):
         cfg["buses"] = [b for b in cfg.get("buses", []) if b["name"] != bus_name]
         cfg["rules"] = [r for r in cfg.get("rules", []) if r.get("target_bus") != bus_name]
         save_config(cfg)
-        apply_once()
-        self.refresh_all()
+        self._apply_once_async()
 
     def _apply_once_async(self, refresh_ui: bool = True):
         # Keep route changes responsive: run potentially slow apply_once() off the GTK main thread.
@@ -1088,8 +1158,11 @@ class MainWindow(Adw.ApplicationWindow):
         self._apply_running = True
 
         def worker():
+            snap = None
             try:
                 apply_once()
+                if self._apply_refresh_requested:
+                    snap = self._read_snapshot()
             finally:
                 def on_done():
                     self._apply_running = False
@@ -1098,8 +1171,11 @@ class MainWindow(Adw.ApplicationWindow):
                     run_again = self._apply_queued
                     self._apply_queued = False
 
-                    if do_refresh:
-                        self.refresh_all()
+                    if do_refresh and not run_again:
+                        if snap is not None:
+                            self._apply_snapshot(snap)
+                        else:
+                            self.refresh_all()
                     if run_again:
                         self._apply_once_async(refresh_ui=True)
                     return False
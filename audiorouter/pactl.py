@@ -2,19 +2,171 @@ from __future__ import annotations
 import os
 import re
 import subprocess
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
 from pathlib import Path
 
 def _in_flatpak() -> bool:
     return bool(os.environ.get("FLATPAK_ID")) or Path("/.flatpak-info").exists()
 
-def _run_pactl(args: List[str]) -> Tuple[int, str, str]:
+def _pactl_cmd(args: List[str]) -> List[str]:
     cmd = ["pactl", *args]
     if _in_flatpak():
         cmd = ["flatpak-spawn", "--host", *cmd]
-    p = subprocess.run(cmd, text=True, capture_output=True)
+    return cmd
+
+def _run_pactl(args: List[str]) -> Tuple[int, str, str]:
+    p = subprocess.run(_pactl_cmd(args), text=True, capture_output=True)
     return p.returncode, p.stdout, p.stderr
 
+def _run_pactl_many(commands: List[List[str]]) -> List[Tuple[int, str, str]]:
+    """
+    Start all commands before waiting on any, so N independent pactl calls
+    cost roughly one round-trip instead of N.
+    """
+    procs = [
+        subprocess.Popen(_pactl_cmd(args), text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        for args in commands
+    ]
+    results = []
+    for p in procs:
+        out, err = p.communicate()
+        results.append((p.returncode, out, err))
+    return results
+
+
+# Queries and the common state changes (module load/unload, moves, mutes) go
+# through one long-lived libpulse client (pulsectl, which ships with the app)
+# when it can connect; pactl stays the fallback and is still used for
+# properties and volume.
+_NATIVE: Any = None
+_NATIVE_LOCK = threading.Lock()
+_NATIVE_DISABLED = False
+_INVALID_INDEX = 0xFFFFFFFF
+_PULSE_ERROR: Any = ()  # pulsectl.PulseError once imported
+_PULSE_OP_INVALID: Any = ()  # pulsectl.PulseOperationInvalid: dead context, not a refusal
+_NO_NATIVE = object()
+
+
+def _native_client() -> Any:
+    """Connected shared client or None. Caller holds _NATIVE_LOCK."""
+    global _NATIVE, _NATIVE_DISABLED, _PULSE_ERROR, _PULSE_OP_INVALID
+    if _NATIVE is not None and not _NATIVE.connected:
+        _drop_native()
+    if _NATIVE is None and not _NATIVE_DISABLED:
+        try:
+            import pulsectl  # type: ignore
+        except Exception:
+            _NATIVE_DISABLED = True
+            return None
+        _PULSE_ERROR = pulsectl.PulseError
+        _PULSE_OP_INVALID = pulsectl.PulseOperationInvalid
+        try:
+            _NATIVE = pulsectl.Pulse("audiorouter-query")
+        except Exception:
+            return None
+    return _NATIVE
+
+
+def native_available() -> bool:
+    """True if queries currently go through the shared libpulse client (no pactl fork)."""
+    if _NATIVE_DISABLED:
+        return False
+    with _NATIVE_LOCK:
+        return _native_client() is not None
+
+
+def _drop_native() -> None:
+    # Server restarted / not up yet: answer via pactl, reconnect next call.
+    global _NATIVE
+    if _NATIVE is not None:
+        try:
+            _NATIVE.close()
+        except Exception:
+            pass
+    _NATIVE = None
+
+
+def _native_query(fn):
+    """Run fn(pulse) on the shared client; None if libpulse is unavailable."""
+    if _NATIVE_DISABLED:
+        return None
+    with _NATIVE_LOCK:
+        pulse = _native_client()
+        if pulse is None:
+            return None
+        try:
+            return fn(pulse)
+        except _PULSE_OP_INVALID:
+            # context died (server restart): reconnect next call
+            _drop_native()
+            return None
+        except _PULSE_ERROR:
+            # e.g. no such sink: the connection itself is fine, keep it
+            return None
+        except Exception:
+            _drop_native()
+            return None
+
+
+def _native_op(fn):
+    """
+    Run a state-changing fn(pulse) on the shared client. Returns _NO_NATIVE if
+    there is no usable client; a refusal by the server raises RuntimeError,
+    like pactl() does.
+    """
+    if _NATIVE_DISABLED:
+        return _NO_NATIVE
+    with _NATIVE_LOCK:
+        pulse = _native_client()
+        if pulse is None:
+            return _NO_NATIVE
+        try:
+            return fn(pulse)
+        except _PULSE_OP_INVALID:
+            # context died (server restart): let pactl do it, reconnect next call
+            _drop_native()
+            return _NO_NATIVE
+        except _PULSE_ERROR as e:
+            raise RuntimeError(str(e) or "pulse operation failed") from None
+        except Exception:
+            _drop_native()
+            return _NO_NATIVE
+
+
+def _skip_refused(op: Any) -> None:
+    """For batches inside one _native_op: a refused item must not abort the rest."""
+    try:
+        op()
+    except _PULSE_OP_INVALID:
+        raise  # dead connection, not a refusal: abort to the fallback
+    except _PULSE_ERROR:
+        pass
+
+
+def _native_or_pactl(fn, *args: str, check: bool = True) -> str:
+    """
+    Apply a change via fn(pulse), or ``pactl *args`` without a client.
+    check=True raises like pactl(), check=False returns "" like try_pactl().
+    """
+    try:
+        out = _native_op(fn)
+    except RuntimeError:
+        if check:
+            raise
+        return ""
+    if out is not _NO_NATIVE:
+        return "" if out is None else str(out)
+    return pactl(*args) if check else try_pactl(*args)
+
+
+def _load_module(module_name: str, *module_args: str, check: bool = True) -> str:
+    return _native_or_pactl(
+        lambda p: p.module_load(module_name, list(module_args)),
+        "load-module", module_name, *module_args,
+        check=check,
+    )
+
 
 def pactl(*args: str) -> str:
     rc, out, err = _run_pactl(list(args))
@@ -26,6 +178,14 @@ def try_pactl(*args: str) -> str:
     rc, out, _ = _run_pactl(list(args))
     return out if rc == 0 else ""
 
+def try_pactl_many(commands: List[List[str]]) -> List[str]:
+    """Run independent pactl commands concurrently; "" for each that failed."""
+    if not commands:
+        return []
+    if len(commands) == 1:
+        return [try_pactl(*commands[0])]
+    return [out if rc == 0 else "" for rc, out, _ in _run_pactl_many(commands)]
+
 
 def collect_debug_snapshot() -> str:
     sections = [
@@ -47,9 +207,15 @@ def collect_debug_snapshot() -> str:
 
 
 def get_default_sink() -> str:
+    native = _native_query(lambda p: p.server_info().default_sink_name or "")
+    if native is not None:
+        return native
     return try_pactl("get-default-sink").strip()
 
 def list_sinks() -> List[Dict[str, str]]:
+    native = _native_query(lambda p: [{"id": str(s.index), "name": s.name} for s in p.sink_list()])
+    if native is not None:
+        return native
     out = try_pactl("list", "short", "sinks")
     sinks = []
     for line in out.splitlines():
@@ -61,6 +227,9 @@ def list_sinks() -> List[Dict[str, str]]:
 
 
 def list_sink_descriptions() -> Dict[str, str]:
+    native = _native_query(lambda p: {s.name: s.description or s.name for s in p.sink_list()})
+    if native is not None:
+        return native
     out = try_pactl("list", "sinks")
     mapping: Dict[str, str] = {}
     cur_name = ""
@@ -84,6 +253,9 @@ def list_sink_descriptions() -> Dict[str, str]:
 
 
 def list_source_descriptions() -> Dict[str, str]:
+    native = _native_query(lambda p: {s.name: s.description or s.name for s in p.source_list()})
+    if native is not None:
+        return native
     out = try_pactl("list", "sources")
     mapping: Dict[str, str] = {}
     cur_name = ""
@@ -105,6 +277,9 @@ def list_source_descriptions() -> Dict[str, str]:
     return mapping
 
 def list_sources() -> List[Dict[str, str]]:
+    native = _native_query(lambda p: [{"id": str(s.index), "name": s.name} for s in p.source_list()])
+    if native is not None:
+        return native
     out = try_pactl("list", "short", "sources")
     srcs = []
     for line in out.splitlines():
@@ -114,6 +289,11 @@ def list_sources() -> List[Dict[str, str]]:
     return srcs
 
 def list_modules() -> List[Dict[str, str]]:
+    native = _native_query(
+        lambda p: [{"id": str(m.index), "name": m.name, "args": m.argument or ""} for m in p.module_list()]
+    )
+    if native is not None:
+        return native
     out = try_pactl("list", "short", "modules")
     mods = []
     for line in out.splitlines():
@@ -123,11 +303,45 @@ def list_modules() -> List[Dict[str, str]]:
     return mods
 
 
-def ensure_module_loaded(module_name: str, *module_args: str) -> None:
-    for m in list_modules():
+def _short_name_ids(kind: str) -> Dict[str, str]:
+    ids: Dict[str, str] = {}
+    for line in try_pactl("list", "short", kind).splitlines():
+        parts = line.split("\t", 2)
+        if len(parts) >= 2:
+            ids[parts[1]] = parts[0]
+    return ids
+
+
+def sink_ids() -> Dict[str, str]:
+    """Sink name -> id, built directly (no per-sink dicts)."""
+    native = _native_query(lambda p: {s.name: str(s.index) for s in p.sink_list()})
+    return native if native is not None else _short_name_ids("sinks")
+
+
+def source_ids() -> Dict[str, str]:
+    """Source name -> id, built directly (no per-source dicts)."""
+    native = _native_query(lambda p: {s.name: str(s.index) for s in p.source_list()})
+    return native if native is not None else _short_name_ids("sources")
+
+
+def snapshot() -> Dict[str, Any]:
+    """
+    Read sinks/sources/modules/default sink once so a reconciliation pass can
+    answer existence and loopback queries without forking pactl per lookup.
+    """
+    return {
+        "default_sink": get_default_sink(),
+        "sinks": sink_ids(),
+        "sources": source_ids(),
+        "modules": list_modules(),
+    }
+
+
+def ensure_module_loaded(module_name: str, *module_args: str, modules: Optional[List[Dict[str, str]]] = None) -> None:
+    for m in (list_modules() if modules is None else modules):
         if m.get("name") == module_name:
             return
-    try_pactl("load-module", module_name, *module_args)
+    _load_module(module_name, *module_args, check=False)
 
 
 def sink_exists(name: str) -> bool:
@@ -139,15 +353,54 @@ def source_exists(name: str) -> bool:
 
 
 def set_source_mute(source_name: str, muted: bool) -> None:
-    try_pactl("set-source-mute", source_name, "1" if muted else "0")
+    _native_or_pactl(
+        lambda p: p.source_mute(p.get_source_by_name(source_name).index, muted),
+        "set-source-mute", source_name, "1" if muted else "0",
+        check=False,
+    )
 
 
 def set_sink_mute(sink_name: str, muted: bool) -> None:
-    try_pactl("set-sink-mute", sink_name, "1" if muted else "0")
+    _native_or_pactl(
+        lambda p: p.sink_mute(p.get_sink_by_name(sink_name).index, muted),
+        "set-sink-mute", sink_name, "1" if muted else "0",
+        check=False,
+    )
 
 
 def set_sink_input_mute(sink_input_id: str, muted: bool) -> None:
-    try_pactl("set-sink-input-mute", sink_input_id, "1" if muted else "0")
+    _native_or_pactl(
+        lambda p: p.sink_input_mute(int(sink_input_id), muted),
+        "set-sink-input-mute", sink_input_id, "1" if muted else "0",
+        check=False,
+    )
+
+
+def set_mute_many(
+    muted: bool,
+    sinks: Iterable[str] = (),
+    sources: Iterable[str] = (),
+    sink_inputs: Iterable[str] = (),
+) -> None:
+    """Set mute on several objects at once; each object is touched only once."""
+    sinks, sources, sink_inputs = list(dict.fromkeys(sinks)), list(dict.fromkeys(sources)), list(dict.fromkeys(sink_inputs))
+
+    def run(p: Any) -> None:
+        for name in sinks:
+            _skip_refused(lambda: p.sink_mute(p.get_sink_by_name(name).index, muted))
+        for name in sources:
+            _skip_refused(lambda: p.source_mute(p.get_source_by_name(name).index, muted))
+        for sid in sink_inputs:
+            _skip_refused(lambda: p.sink_input_mute(int(sid), muted))
+
+    if _native_op(run) is not _NO_NATIVE:
+        return
+    flag = "1" if muted else "0"
+    try_pactl_many(
+        [["set-sink-mute", name, flag] for name in sinks]
+        + [["set-source-mute", name, flag] for name in sources]
+        + [["set-sink-input-mute", sid, flag] for sid in sink_inputs]
+    )
 
 
 def set_sink_volume(sink_name: str, volume: str) -> None:
@@ -159,6 +412,9 @@ def change_sink_volume(sink_name: str, delta: str) -> None:
 
 
 def get_sink_mute(sink_name: str) -> bool:
+    native = _native_query(lambda p: bool(p.get_sink_by_name(sink_name).mute))
+    if native is not None:
+        return native
     out = try_pactl("get-sink-mute", sink_name).strip().lower()
     # Handles EN/DE output from pactl, e.g. "Mute: yes" / "Stumm: ja".
     if any(tok in out for tok in (" yes", ":yes", " ja", ":ja")):
@@ -168,7 +424,16 @@ def get_sink_mute(sink_name: str) -> bool:
     return False
 
 
+def _native_volume_percent(pulse: Any, sink_name: str) -> int:
+    # first channel, like the pactl output parse below
+    values = pulse.get_sink_by_name(sink_name).volume.values
+    return max(0, min(100, int(round(values[0] * 100)))) if values else 0
+
+
 def get_sink_volume_percent(sink_name: str) -> int | None:
+    native = _native_query(lambda p: _native_volume_percent(p, sink_name))
+    if native is not None:
+        return native
     out = try_pactl("get-sink-volume", sink_name)
     match = re.search(r"(\d{1,3})%", out)
     if not match:
@@ -180,12 +445,12 @@ def get_sink_volume_percent(sink_name: str) -> int | None:
         return None
 
 
-def tag_system_sink(sink_name: str = "vsink.system") -> None:
+def tag_system_sink(sink_name: str = "vsink.system", sinks: Optional[Iterable[str]] = None) -> None:
     """
     Hint Pulse/PipeWire to place event/notification streams on the system bus
     immediately at stream creation time.
     """
-    if not sink_exists(sink_name):
+    if not (sink_name in sinks if sinks is not None else sink_exists(sink_name)):
         return
     # include both role names commonly used by Pulse/PipeWire clients
     try_pactl("set-sink-properties", sink_name, "device.intended_roles=event notification")
@@ -193,11 +458,11 @@ def tag_system_sink(sink_name: str = "vsink.system") -> None:
 
 def unload_module(module_id: str) -> None:
     if module_id:
-        try_pactl("unload-module", module_id)
+        _native_or_pactl(lambda p: p.module_unload(int(module_id)), "unload-module", module_id, check=False)
 
 def load_null_sink(bus_name: str, label: str) -> str:
-    out = pactl(
-        "load-module", "module-null-sink",
+    out = _load_module(
+        "module-null-sink",
         f"sink_name={bus_name}",
         f"sink_properties=device.description={label}"
     )
@@ -246,8 +511,8 @@ def current_loopback_sink_for_source(source_name: str) -> str:
                 return tok.split("=", 1)[1]
     return ""
 
-def loopback_exists(source_name: str, sink_name: str) -> bool:
-    for m in list_modules():
+def loopback_exists(source_name: str, sink_name: str, modules: Optional[List[Dict[str, str]]] = None) -> bool:
+    for m in (list_modules() if modules is None else modules):
         if m.get("name") != "module-loopback":
             continue
         args = m.get("args", "") or ""
@@ -256,25 +521,64 @@ def loopback_exists(source_name: str, sink_name: str) -> bool:
     return False
 
 
-def cleanup_wrong_loopbacks_for_source(source_name: str, wanted_sink: str) -> None:
+def module_args(args: str) -> Dict[str, str]:
+    """Exact key=value tokens of a module argument string (no substring matches)."""
+    return dict(tok.split("=", 1) for tok in (args or "").split() if "=" in tok)
+
+
+def loopback_index(modules: Optional[List[Dict[str, str]]] = None) -> Dict[str, Dict[str, str]]:
+    """
+    source -> {sink: module_id} for all loaded module-loopback instances, so
+    callers checking several sources scan the module list only once.
+    """
+    index: Dict[str, Dict[str, str]] = {}
+    for m in (list_modules() if modules is None else modules):
+        if m.get("name") != "module-loopback":
+            continue
+        args = module_args(m.get("args", ""))
+        src, sink = args.get("source"), args.get("sink")
+        if src and sink:
+            index.setdefault(src, {})[sink] = m["id"]
+    return index
+
+
+def cleanup_wrong_loopbacks_for_source(
+    source_name: str,
+    wanted_sink: str,
+    modules: Optional[List[Dict[str, str]]] = None,
+) -> List[str]:
     """
     Entfernt nur Loopbacks, die von source_name kommen, aber NICHT auf wanted_sink zeigen.
     Lässt das korrekte Loopback in Ruhe (wichtig gegen Create/Delete-Schleifen).
+    Gibt die IDs der entladenen Module zurück.
     """
-    for m in list_modules():
+    removed: List[str] = []
+    for m in (list_modules() if modules is None else modules):
         if m.get("name") != "module-loopback":
             continue
         args = m.get("args", "") or ""
         if f"source={source_name}" in args and f"sink={wanted_sink}" not in args:
             unload_module(m["id"])
+            removed.append(m["id"])
+    return removed
 
 
 
 
 
-def load_loopback(source_name: str, sink_name: str, latency_msec: int = 30) -> str:
-    out = pactl(
-        "load-module", "module-loopback",
+def load_loopback(
+    source_name: str,
+    sink_name: str,
+    latency_msec: int = 30,
+    replace: bool = False,
+    modules: Optional[List[Dict[str, str]]] = None,
+) -> str:
+    """
+    Load source_name -> sink_name. With replace=True, loopbacks from the same
+    source to other sinks are removed right after (make-before-break).
+    """
+    out = _load_module(
+        "module-loopback",
         f"source={source_name}",
         f"sink={sink_name}",
         f"latency_msec={latency_msec}",
@@ -282,6 +586,9 @@ def load_loopback(source_name: str, sink_name: str, latency_msec: int = 30) -> s
     )
     module_id = out.strip()
 
+    if replace:
+        cleanup_wrong_loopbacks_for_source(source_name, sink_name, modules)
+
     # Loopback-Knoten verstecken (PipeWire Name: loopback-<id>)
     loop_name = f"loopback-{module_id}"
     try:
@@ -298,15 +605,45 @@ def load_loopback(source_name: str, sink_name: str, latency_msec: int = 30) -> s
 
 
 def move_sink_input(sink_input_id: str, target_sink: str) -> None:
-    pactl("move-sink-input", sink_input_id, target_sink)
+    _native_or_pactl(
+        lambda p: p.sink_input_move(int(sink_input_id), p.get_sink_by_name(target_sink).index),
+        "move-sink-input", sink_input_id, target_sink,
+    )
+
+
+def move_sink_inputs(moves: Dict[str, str]) -> None:
+    """Move several sink-inputs (id -> target sink) at once; failures are ignored."""
+    def run(p: Any) -> None:
+        sink_index: Dict[str, int] = {}
+        for sid, target in moves.items():
+            def move() -> None:
+                if target not in sink_index:
+                    sink_index[target] = p.get_sink_by_name(target).index
+                p.sink_input_move(int(sid), sink_index[target])
+            _skip_refused(move)
+
+    if _native_op(run) is not _NO_NATIVE:
+        return
+    try_pactl_many([["move-sink-input", sid, target] for sid, target in moves.items()])
 
 
 def move_source_output(source_output_id: str, target_source: str) -> None:
-    pactl("move-source-output", source_output_id, target_source)
+    _native_or_pactl(
+        lambda p: p.source_output_move(int(source_output_id), p.get_source_by_name(target_source).index),
+        "move-source-output", source_output_id, target_source,
+    )
 
 
 # list_source_outputs: DE/EN parser for microphone/capture streams
 def list_source_outputs() -> List[Dict[str, Any]]:
+    native = _native_query(
+        lambda p: [
+            {"id": str(o.index), "props": dict(o.proplist), "source_id": str(o.source)}
+            for o in p.source_output_list()
+        ]
+    )
+    if native is not None:
+        return native
     out = try_pactl("list", "source-outputs")
     items: List[Dict[str, Any]] = []
     cur: Optional[Dict[str, Any]] = None
@@ -343,7 +680,18 @@ def list_source_outputs() -> List[Dict[str, Any]]:
     return items
 
 # list_sink_inputs: DE/EN + nur in Eigenschaften/Properties parsen
-def list_sink_inputs() -> List[Dict[str, Any]]:
+def _native_sink_input(i: Any) -> Dict[str, Any]:
+    item: Dict[str, Any] = {"id": str(i.index), "props": dict(i.proplist), "sink_id": str(i.sink)}
+    if i.owner_module is not None and i.owner_module != _INVALID_INDEX:
+        item["owner_module"] = str(i.owner_module)
+    return item
+
+def list_sink_inputs(predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+    """All sink-inputs; with `predicate`, only those it accepts (filtered while parsing)."""
+    keep = predicate or (lambda _item: True)
+    native = _native_query(lambda p: [item for item in map(_native_sink_input, p.sink_input_list()) if keep(item)])
+    if native is not None:
+        return native
     out = try_pactl("list", "sink-inputs")
     items: List[Dict[str, Any]] = []
     cur: Optional[Dict[str, Any]] = None
@@ -353,7 +701,7 @@ def list_sink_inputs() -> List[Dict[str, Any]]:
         line = raw.strip()
 
         if line.startswith("Sink Input #") or line.startswith("Ziel-Eingabe #"):
-            if cur:
+            if cur and keep(cur):
                 items.append(cur)
             cur = {"id": line.split("#", 1)[1].strip(), "props": {}}
             in_props = False
@@ -380,11 +728,48 @@ def list_sink_inputs() -> List[Dict[str, Any]]:
             k, v = line.split("=", 1)
             cur["props"][k.strip()] = v.strip().strip('"')
 
-    if cur:
+    if cur and keep(cur):
         items.append(cur)
 
     return items
 
+def _native_lookup(getter: Any, index: str, convert: Any) -> Dict[str, Any]:
+    try:
+        return convert(getter(int(index)))
+    except _PULSE_OP_INVALID:
+        raise  # dead connection: _native_query falls back
+    except _PULSE_ERROR:
+        return {}  # gone already
+
+
+def get_sink_input(sink_input_id: str) -> Optional[Dict[str, Any]]:
+    """One sink-input by id (same shape as list_sink_inputs items), or None."""
+    sid = str(sink_input_id).strip()
+    if not sid.isdigit():
+        return None
+    native = _native_query(lambda p: _native_lookup(p.sink_input_info, sid, _native_sink_input))
+    if native is not None:
+        return native or None
+    return next((i for i in list_sink_inputs() if i.get("id") == sid), None)
+
+
+def get_source_output(source_output_id: str) -> Optional[Dict[str, Any]]:
+    """One source-output by id (same shape as list_source_outputs items), or None."""
+    sid = str(source_output_id).strip()
+    if not sid.isdigit():
+        return None
+    native = _native_query(
+        lambda p: _native_lookup(
+            p.source_output_info,
+            sid,
+            lambda o: {"id": str(o.index), "props": dict(o.proplist), "source_id": str(o.source)},
+        )
+    )
+    if native is not None:
+        return native or None
+    return next((o for o in list_source_outputs() if o.get("id") == sid), None)
+
+
 def sink_inputs_for_owner_module(module_id: str) -> List[str]:
     if not module_id:
         return []